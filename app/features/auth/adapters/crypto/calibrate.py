@@ -0,0 +1,110 @@
+"""
+Argon2 parameter calibration
+Measures hash latency and peak RSS on this host and recommends
+ARGON2_TIME_COST / ARGON2_MEMORY_COST / ARGON2_PARALLELISM for a target latency.
+
+Usage:
+    python -m app.features.auth.adapters.crypto.calibrate --target-ms 250 --budget-mb 256
+"""
+
+import argparse
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from argon2 import PasswordHasher as A2
+
+MEMORY_COSTS_KIB = [19456, 47104, 65536, 102400, 131072]
+PARALLELISMS = [1, 2, 4, 8]
+MAX_TIME_COST = 10
+
+
+def _measure(memory_cost: int, parallelism: int, target_ms: float, samples: int) -> Dict:
+    """Runs in a fresh child process so ru_maxrss reflects only this parameter set."""
+    baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings: Dict[int, float] = {}
+
+    for time_cost in range(1, MAX_TIME_COST + 1):
+        ph = A2(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+        runs = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            ph.hash("calibration-password")
+            runs.append((time.perf_counter() - started) * 1000)
+        timings[time_cost] = statistics.median(runs)
+        if timings[time_cost] > target_ms:
+            break
+
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "memory_cost": memory_cost,
+        "parallelism": parallelism,
+        "timings": timings,
+        "rss_mb": max(0, peak_kib - baseline_kib) / 1024,
+    }
+
+
+def calibrate(target_ms: float, samples: int = 3) -> List[Dict]:
+    results = []
+    for memory_cost in MEMORY_COSTS_KIB:
+        for parallelism in PARALLELISMS:
+            with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+                results.append(pool.submit(_measure, memory_cost, parallelism, target_ms, samples).result())
+    return results
+
+
+def recommend(results: List[Dict], target_ms: float) -> Dict | None:
+    """Pick the parameter set with the highest memory x time cost that still meets the target."""
+    best = None
+    for result in results:
+        fitting = [t for t, ms in result["timings"].items() if ms <= target_ms]
+        if not fitting:
+            continue
+        time_cost = max(fitting)
+        candidate = {
+            "time_cost": time_cost,
+            "memory_cost": result["memory_cost"],
+            "parallelism": result["parallelism"],
+            "latency_ms": result["timings"][time_cost],
+            "rss_mb": result["rss_mb"],
+        }
+        score = (candidate["memory_cost"] * time_cost, -candidate["latency_ms"])
+        if best is None or score > best[0]:
+            best = (score, candidate)
+    return best[1] if best else None
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Calibrate Argon2 parameters for this host")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="target latency per hash")
+    parser.add_argument("--budget-mb", type=int, default=256, help="PASSWORD_HASH_MEMORY_BUDGET_MB per worker")
+    parser.add_argument("--samples", type=int, default=3, help="hashes per measurement")
+    args = parser.parse_args(argv)
+
+    results = calibrate(args.target_ms, args.samples)
+
+    print(f"{'memory_kib':>10} {'par':>4} {'rss_mb':>8}  latency per time_cost (ms)")
+    for result in results:
+        timings = "  ".join(f"t{t}={ms:.0f}" for t, ms in result["timings"].items())
+        print(f"{result['memory_cost']:>10} {result['parallelism']:>4} {result['rss_mb']:>8.1f}  {timings}")
+
+    best = recommend(results, args.target_ms)
+    if best is None:
+        print(f"\nNo parameter set hashes within {args.target_ms:.0f} ms on this host")
+        return 1
+
+    per_hash_mb = max(best["rss_mb"], best["memory_cost"] / 1024)
+    concurrent = max(1, int(args.budget_mb // per_hash_mb))
+    print(f"\nRecommended (~{best['latency_ms']:.0f} ms, ~{per_hash_mb:.0f} MB per hash):")
+    print(f"ARGON2_TIME_COST={best['time_cost']}")
+    print(f"ARGON2_MEMORY_COST={best['memory_cost']}")
+    print(f"ARGON2_PARALLELISM={best['parallelism']}")
+    print(f"# {concurrent} concurrent hash(es) fit in PASSWORD_HASH_MEMORY_BUDGET_MB={args.budget_mb}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
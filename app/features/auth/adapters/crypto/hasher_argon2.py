@@ -17,5 +17,10 @@ class Argon2Hasher(PasswordHasher):
         except Exception:
             return False
 
+    @property
+    def memory_cost(self) -> int:
+        """Memory allocated per hash, in KiB."""
+        return self._ph.memory_cost
+
     def needs_rehash(self, hashed: str) -> bool:
         return self._ph.check_needs_rehash(hashed)
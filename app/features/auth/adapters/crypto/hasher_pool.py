@@ -0,0 +1,147 @@
+# app/features/auth/adapters/crypto/hasher_pool.py
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.features.auth.use_cases.ports import (
+    AsyncPasswordHasher,
+    PasswordHasher,
+    PasswordHasherBusy,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _timed(fn: Callable[..., Any], *args: Any):
+    # Runs inside the pool; returns the moment the job actually started so the
+    # caller can compute queue wait time. time.monotonic is system-wide, so this
+    # is also valid across processes.
+    started = time.monotonic()
+    return started, fn(*args)
+
+
+class PooledPasswordHasher(AsyncPasswordHasher):
+    """Runs a blocking PasswordHasher in a bounded executor, off the event loop.
+
+    At most ``max_concurrent`` jobs run at once and at most ``max_queue`` more may wait.
+    Anything beyond that is rejected immediately with PasswordHasherBusy instead of
+    piling up behind a login storm.
+    """
+
+    def __init__(self, hasher: PasswordHasher, executor: Executor, max_concurrent: int, max_queue: int):
+        self._hasher = hasher
+        self._executor = executor
+        self._max_concurrent = max_concurrent
+        self._capacity = max_concurrent + max_queue
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @classmethod
+    def create(
+        cls,
+        hasher: PasswordHasher,
+        mode: str = "thread",
+        max_workers: int = 2,
+        max_queue: int = 32,
+        memory_per_job_kib: Optional[int] = None,
+        memory_budget_mb: Optional[int] = None,
+    ):
+        """Build a pool whose concurrency also fits within ``memory_budget_mb``.
+
+        Each Argon2 job allocates ``memory_cost`` KiB, so the number of jobs allowed to
+        run together is capped at ``budget // memory_per_job``. A budget smaller than one
+        job still allows one at a time, with a warning, so logins keep working.
+        """
+        max_concurrent = max_workers
+        if memory_per_job_kib and memory_budget_mb:
+            fitting = memory_budget_mb * 1024 // memory_per_job_kib
+            if fitting < 1:
+                logger.warning(
+                    f"Password hash memory budget ({memory_budget_mb} MiB) is below the memory of one hash "
+                    f"({memory_per_job_kib} KiB); running one hash at a time, over budget. "
+                    "Raise PASSWORD_HASH_MEMORY_BUDGET_MB or lower ARGON2_MEMORY_COST."
+                )
+            max_concurrent = max(1, min(max_workers, fitting))
+
+        if mode == "process":
+            executor = ProcessPoolExecutor(max_workers=max_concurrent)
+        elif mode == "thread":
+            executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="password-hasher")
+        else:
+            raise ValueError(f"Unknown password hasher executor: {mode}")
+        return cls(hasher, executor, max_concurrent=max_concurrent, max_queue=max_queue)
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any):
+        if self._in_flight >= self._capacity:
+            self._rejected += 1
+            raise PasswordHasherBusy(f"Password hasher saturated ({self._in_flight}/{self._capacity} jobs in flight)")
+
+        self._in_flight += 1
+        enqueued = time.monotonic()
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            self._in_flight -= 1
+            raise
+
+        self._running += 1
+        try:
+            job = asyncio.get_running_loop().run_in_executor(self._executor, _timed, fn, *args)
+        except BaseException:
+            # e.g. the executor was already shut down
+            self._release()
+            raise
+        # A started job cannot be stopped: it keeps its slot until it finishes, even when
+        # the caller is cancelled, so the limits count the work actually running
+        job.add_done_callback(self._job_done)
+        started, result = await asyncio.shield(job)
+
+        wait = max(0.0, started - enqueued)
+        self._completed += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        return result
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._in_flight -= 1
+        self._slots.release()
+
+    def _job_done(self, job: asyncio.Future) -> None:
+        self._release()
+        if not job.cancelled():
+            job.exception()  # retrieved here when the caller was cancelled and never awaits it
+
+    async def hash(self, raw: str) -> str:
+        return await self._submit(self._hasher.hash, raw)
+
+    async def verify(self, raw: str, hashed: str) -> bool:
+        return await self._submit(self._hasher.verify, raw, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        # Only parses the encoded parameters, cheap enough to stay on the loop.
+        return self._hasher.needs_rehash(hashed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "running": self._running,
+            "queue_depth": self._in_flight - self._running,
+            "max_concurrent": self._max_concurrent,
+            "capacity": self._capacity,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "wait_avg_ms": (self._wait_total / self._completed * 1000) if self._completed else 0.0,
+            "wait_max_ms": self._wait_max * 1000,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,6 +1,10 @@
+from fastapi.responses import Response
+
 from app.features.auth.api.schemas import TokenOut
+from app.utils.responses import present
 
 
 class AuthPresenter:
-    def present(self, access_token: str) -> dict:
-        return TokenOut(access_token=access_token, token_type="bearer").model_dump()
+    def present(self, access_token: str) -> Response:
+        # Built from our own values, so no validation; response_model=TokenOut only documents it
+        return present(TokenOut.model_construct(access_token=access_token, token_type="bearer"))
@@ -0,0 +1,125 @@
+from typing import Optional
+
+from app.features.auth.entities.user import User, UserCredentials
+from app.features.auth.use_cases.ports import UserRepository
+from app.utils.cache import (
+    CACHE_TTL,
+    NEGATIVE,
+    NEGATIVE_CACHE_TTL,
+    delete_user_cache,
+    delete_user_email_cache,
+    get_user_cache,
+    get_user_email_cache,
+    set_user_cache,
+    set_user_email_cache,
+    user_cache_key,
+    user_email_cache_key,
+    user_flight,
+)
+from app.utils.http_cache import invalidate_tags
+
+from .loaders import load_user_by_email, user_loader
+from .mappers import from_cache, to_cache
+
+
+class CachedUserRepository(UserRepository):
+    """Read-through cache in front of a UserRepository.
+
+    ``by_id`` and ``by_email`` are served from app.utils.cache; users are stored as
+    compact encoded entities under their id, emails as an index pointing at the id.
+    Lookups that find nothing are cached for NEGATIVE_CACHE_TTL. Writes invalidate
+    both the id entry and the email index. Misses go through ``user_flight`` so
+    concurrent requests for the same user share a single database load; that load
+    runs on its own session (``user_loader``, ``load_user_by_email``), never on the
+    session of whichever request started it, and only sees committed rows.
+
+    With ``replica_reads``, ``by_email`` misses are answered by ``inner``, which may read
+    from a replica that has not seen a recent write yet, and are not cached. ``by_id``
+    loads stay consistent through ``consistent_read_session``.
+    """
+
+    def __init__(self, inner: UserRepository, replica_reads: bool = False):
+        self.inner = inner
+        self.replica_reads = replica_reads
+
+    async def _remember(self, user: User) -> None:
+        await set_user_cache(user.id, to_cache(user))
+        await set_user_email_cache(user.email, user.id)
+
+    async def _load_by_id(self, user_id: str) -> Optional[User]:
+        user = await user_loader.load(user_id)
+        if user:
+            await self._remember(user)
+        else:
+            await set_user_cache(user_id, NEGATIVE, ttl=NEGATIVE_CACHE_TTL)
+        return user
+
+    async def _load_by_email(self, email: str) -> Optional[User]:
+        user = await load_user_by_email(email)
+        if user:
+            await self._remember(user)
+        else:
+            await set_user_email_cache(email, NEGATIVE, ttl=NEGATIVE_CACHE_TTL)
+        return user
+
+    async def by_id(self, user_id: str) -> Optional[User]:
+        key = user_cache_key(user_id)
+        cached = await get_user_cache(user_id)
+        if cached is not None and not user_flight.refresh_due(key):
+            return from_cache(cached) if cached != NEGATIVE else None
+
+        return await user_flight.do(key, lambda: self._load_by_id(user_id), ttl=CACHE_TTL)
+
+    async def by_email(self, email: str) -> Optional[User]:
+        key = user_email_cache_key(email)
+        user_id = await get_user_email_cache(email)
+        if user_id == NEGATIVE:
+            return None
+        if user_id is not None and not user_flight.refresh_due(key):
+            cached = await get_user_cache(user_id)
+            if cached is not None and cached != NEGATIVE:
+                return from_cache(cached)
+
+        if self.replica_reads:
+            return await self.inner.by_email(email)
+        return await user_flight.do(key, lambda: self._load_by_email(email), ttl=CACHE_TTL)
+
+    async def by_username(self, username: str) -> Optional[User]:
+        return await self.inner.by_username(username)
+
+    async def credentials_by_username(self, username: str) -> Optional[UserCredentials]:
+        return await self.inner.credentials_by_username(username)
+
+    async def credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        return await self.inner.credentials_by_email(email)
+
+    async def _invalidate_id(self, user_id: str) -> None:
+        cached = await get_user_cache(user_id)
+        if cached and cached != NEGATIVE:
+            # The email may have changed; drop the index entry of the old one too.
+            await self._invalidate_email(from_cache(cached).email)
+        await delete_user_cache(user_id)
+        user_flight.forget(user_cache_key(user_id))
+        await invalidate_tags("users")
+
+    async def _invalidate_email(self, email: str) -> None:
+        await delete_user_email_cache(email)
+        user_flight.forget(user_email_cache_key(email))
+
+    async def invalidate(self, user: User) -> None:
+        await self._invalidate_id(user.id)
+        await self._invalidate_email(user.email)
+
+    async def save(self, u: User):
+        result = await self.inner.save(u)
+        await self.invalidate(u)
+        return result
+
+    async def update(self, u: User):
+        result = await self.inner.update(u)
+        await self.invalidate(u)
+        return result
+
+    async def update_password_hash(self, user_id: str, password_hash: str) -> None:
+        await self.inner.update_password_hash(user_id, password_hash)
+        await self._invalidate_id(user_id)
@@ -0,0 +1,31 @@
+from typing import Dict, List, Optional
+
+from app.features.auth.entities.user import User
+from app.platform.config import db_settings
+from app.platform.db.engine import AsyncSessionLocal, consistent_read_session
+from app.utils.dataloader import DataLoader
+
+from .user_repository import UserRepository
+
+
+async def load_users(user_ids: List[str]) -> Dict[str, User]:
+    # Shared by all requests on the worker, so it cannot borrow a request session.
+    # Read-only: goes to a replica unless one of the users was just written (on any worker
+    # when the cache has a shared L2), so the user cache is never refilled with a stale row.
+    async with consistent_read_session(*user_ids) as session:
+        return await UserRepository(session).by_ids(user_ids)
+
+
+async def load_user_by_email(email: str) -> Optional[User]:
+    # Shared by every request waiting on one user_flight load, so it opens its own session.
+    # On the primary: the user id to check for a recent write is not known before the read.
+    async with AsyncSessionLocal() as session:
+        return await UserRepository(session).by_email(email)
+
+
+# Per-worker loader: by_id calls within one loop tick become one SELECT ... WHERE id IN (...)
+user_loader: DataLoader[str, User] = DataLoader(
+    load_users,
+    max_batch_size=db_settings.BATCH_LOAD_MAX_SIZE,
+    window=db_settings.BATCH_LOAD_WINDOW_MS / 1000,
+)
@@ -1,6 +1,17 @@
+from dataclasses import fields
+from datetime import datetime
+
+import orjson
+
 from app.features.auth.entities.user import User
 from app.platform.db.models import UserModel
 
+# Field order of the compact cache encoding; append only, never reorder (bump the key
+# version in app.utils.cache.user_cache_key otherwise). The password hash never leaves
+# the database through the cache: login reads credentials directly.
+_CACHE_FIELDS = tuple(f.name for f in fields(User) if f.name != "password_hash")
+_CACHE_DATETIMES = ("created_at", "updated_at")
+
 
 def to_entity(model: UserModel) -> User:
     return User(
@@ -20,3 +31,16 @@ def to_entity(model: UserModel) -> User:
         created_at=model.created_at,
         updated_at=model.updated_at,
     )
+
+
+def to_cache(user: User) -> bytes:
+    """Encode a User, minus its password hash, as a positional orjson array for the principal cache."""
+    return orjson.dumps([getattr(user, name) for name in _CACHE_FIELDS])
+
+
+def from_cache(data: bytes) -> User:
+    values = dict(zip(_CACHE_FIELDS, orjson.loads(data)))
+    for name in _CACHE_DATETIMES:
+        if values.get(name) is not None:
+            values[name] = datetime.fromisoformat(values[name])
+    return User(password_hash="", **values)
@@ -1,23 +1,43 @@
-from typing import Optional
+from typing import Dict, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.features.auth.entities.user import User
+from app.features.auth.entities.user import User, UserCredentials
 from app.features.auth.use_cases.ports import UserRepository
+from app.platform.db.engine import replica_router
 from app.platform.db.models import UserModel
+from app.utils.dataloader import DataLoader
 
 from .mappers import to_entity
 
+# Core projections for UserCredentials, built once: the rows are plain tuples, so no ORM
+# loading or identity-map tracking happens and the statement is not rebuilt per call.
+_users = UserModel.__table__
+_CREDENTIALS_BY_NAME = select(_users.c.id, _users.c.password_hash, _users.c.role_id).where(
+    _users.c.name == bindparam("value")
+)
+_CREDENTIALS_BY_EMAIL = select(_users.c.id, _users.c.password_hash, _users.c.role_id).where(
+    _users.c.email == bindparam("value")
+)
+
 
 class UserRepository(UserRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, loader: Optional[DataLoader[str, User]] = None):
         self.session = session
+        # When set, by_id is batched with other requests on this worker (committed data only)
+        self.loader = loader
 
     async def by_id(self, user_id: str) -> Optional[User]:
+        if self.loader is not None:
+            return await self.loader.load(user_id)
         user = await self.session.get(UserModel, user_id)
         return to_entity(user) if user else None
 
+    async def by_ids(self, user_ids: Sequence[str]) -> Dict[str, User]:
+        users = await self.session.scalars(select(UserModel).where(UserModel.id.in_(user_ids)))
+        return {user.id: to_entity(user) for user in users}
+
     async def by_email(self, email: str) -> Optional[User]:
         user = await self.session.scalar(select(UserModel).where(UserModel.email == email))
         return to_entity(user) if user else None
@@ -26,8 +46,29 @@ class UserRepository(UserRepository):
         user = await self.session.scalar(select(UserModel).where(UserModel.name == username))
         return to_entity(user) if user else None
 
+    async def credentials_by_username(self, username: str) -> Optional[UserCredentials]:
+        row = (await self.session.execute(_CREDENTIALS_BY_NAME, {"value": username})).first()
+        return UserCredentials(*row) if row else None
+
+    async def credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        row = (await self.session.execute(_CREDENTIALS_BY_EMAIL, {"value": email})).first()
+        return UserCredentials(*row) if row else None
+
+    async def update_password_hash(self, user_id: str, password_hash: str) -> None:
+        await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(password_hash=password_hash)
+            .execution_options(synchronize_session=False)
+        )
+        # Runs as a side effect of a read flow (login), whose session is never committed otherwise
+        await self.session.commit()
+        await replica_router.pin(user_id)
+
     async def save(self, u: User):
         await self.session.add(u)
+        await replica_router.pin(u.id)
 
     async def update(self, u: User):
         await self.session.merge(u)
+        await replica_router.pin(u.id)
@@ -4,7 +4,7 @@ from typing import List, Optional
 from jose import JWTError, jwt
 from pytz import timezone
 
-from app.features.auth.entities.user import User
+from app.features.auth.entities.user import User, UserCredentials
 from app.features.auth.use_cases.ports import TokenService
 from app.platform.config import app_settings, security_settings
 
@@ -14,7 +14,7 @@ class JWTService(TokenService):
         self.app_settings = app_settings
         self.security_settings = security_settings
 
-    def issue_access(self, user: User, scopes: Optional[List[str]] = None) -> str:
+    def issue_access(self, user: User | UserCredentials, scopes: Optional[List[str]] = None) -> str:
         now = datetime.now(timezone(self.app_settings.TIMEZONE))
         expire = now + timedelta(minutes=self.security_settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         payload = {
@@ -0,0 +1,83 @@
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.features.auth.entities.user import User, UserCredentials
+from app.features.auth.use_cases.ports import TokenService
+
+
+class CachedTokenService(TokenService):
+    """TokenService decorator that memoizes verified claims per token.
+
+    Entries are keyed by a digest of the token (raw tokens are never kept), bounded
+    by an LRU of ``max_size`` and expire no later than the token's own ``exp``.
+    Only successfully verified tokens are cached, so a rejected token is re-checked
+    on every request. Callers get their own copy of the claims, so one that adds or
+    changes keys cannot alter what later requests with the same token see.
+    """
+
+    def __init__(self, inner: TokenService, max_size: int = 10000, max_ttl: int = 300):
+        self._inner = inner
+        self._max_size = max_size
+        self._max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=20).digest()
+
+    def issue_access(self, user: User | UserCredentials, scopes: Optional[List[str]] = None) -> str:
+        return self._inner.issue_access(user, scopes)
+
+    def issue_refresh(self, user: User) -> str:
+        return self._inner.issue_refresh(user)
+
+    def parse(self, token: str):
+        key = self._digest(token)
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, claims = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(claims)
+            del self._entries[key]
+            self._expirations += 1
+
+        self._misses += 1
+        claims = self._inner.parse(token)
+        if claims and "exp" in claims:
+            expires_at = min(float(claims["exp"]), now + self._max_ttl)
+            if expires_at > now:
+                self._entries[key] = (expires_at, copy.deepcopy(claims))
+                if len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return claims
+
+    def invalidate(self, token: str) -> None:
+        self._entries.pop(self._digest(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
@@ -4,20 +4,54 @@ from functools import lru_cache
 from fastapi import Depends
 
 from app.features.auth.adapters.crypto.hasher_argon2 import Argon2Hasher
+from app.features.auth.adapters.crypto.hasher_pool import PooledPasswordHasher
+from app.features.auth.adapters.repositories.cached_user_repository import CachedUserRepository
+from app.features.auth.adapters.repositories.loaders import user_loader
 from app.features.auth.adapters.repositories.user_repository import UserRepository
 from app.features.auth.adapters.services.jwt_service import JWTService
-from app.platform.db.engine import get_session
+from app.features.auth.adapters.services.token_cache import CachedTokenService
+from app.platform.config import security_settings
+from app.platform.db.engine import get_read_session, get_session
 
 
 def get_user_repo(s=Depends(get_session)):
-    return UserRepository(s)
+    return CachedUserRepository(UserRepository(s))
+
+
+def get_read_user_repo(s=Depends(get_read_session)):
+    """Repository for read-only flows: lookups may be served by a replica."""
+    return CachedUserRepository(UserRepository(s, loader=user_loader), replica_reads=True)
 
 
 @lru_cache
 def get_password_hasher():
-    return Argon2Hasher()
+    hasher = Argon2Hasher(
+        time_cost=security_settings.ARGON2_TIME_COST,
+        memory_cost=security_settings.ARGON2_MEMORY_COST,
+        parallelism=security_settings.ARGON2_PARALLELISM,
+    )
+    return PooledPasswordHasher.create(
+        hasher,
+        mode=security_settings.PASSWORD_HASH_EXECUTOR,
+        max_workers=security_settings.PASSWORD_HASH_WORKERS,
+        max_queue=security_settings.PASSWORD_HASH_QUEUE_SIZE,
+        memory_per_job_kib=hasher.memory_cost,
+        memory_budget_mb=security_settings.PASSWORD_HASH_MEMORY_BUDGET_MB,
+    )
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the hasher pool if one was built; never builds one only to stop it."""
+    if get_password_hasher.cache_info().currsize:
+        get_password_hasher().shutdown()
 
 
 @lru_cache
 def get_token_service():
-    return JWTService()
+    if security_settings.TOKEN_CACHE_SIZE <= 0:
+        return JWTService()
+    return CachedTokenService(
+        JWTService(),
+        max_size=security_settings.TOKEN_CACHE_SIZE,
+        max_ttl=security_settings.TOKEN_CACHE_TTL,
+    )
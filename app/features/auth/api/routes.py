@@ -10,19 +10,28 @@ from app.features.auth.api.deps import (
 )
 from app.features.auth.api.schemas import TokenOut
 from app.features.auth.use_cases.login import Login
+from app.features.auth.use_cases.ports import PasswordHasherBusy
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=TokenOut)
-def issue_token(
+async def issue_token(
     form: OAuth2PasswordRequestForm = Depends(),
     repo=Depends(get_user_repo),
     hasher=Depends(get_password_hasher),
     tokens=Depends(get_token_service),
 ):
     try:
-        result = Login(repo=repo, hasher=hasher, tokens=tokens).execute(username=form.username, password=form.password)
+        result = await Login(repo=repo, hasher=hasher, token_service=tokens).execute(
+            username=form.username, password=form.password
+        )
         return AuthPresenter().present(result["access_token"])
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login temporarily unavailable, try again shortly",
+            headers={"Retry-After": "1"},
+        )
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
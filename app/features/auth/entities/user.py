@@ -18,5 +18,14 @@ class User:
     is_verified: bool = False
     created_by: Optional[str] = None
     updated_by: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class UserCredentials:
+    """The slice of a user that login needs, loaded without the full profile."""
+
+    id: str
+    password_hash: str
+    role_id: Optional[int] = None
@@ -1,20 +1,22 @@
-from .ports import PasswordHasher, TokenService, UserRepository
+from .ports import AsyncPasswordHasher, TokenService, UserRepository
 
 
 class Login:
-    def __init__(self, repo: UserRepository, hasher: PasswordHasher, token_service: TokenService):
+    def __init__(self, repo: UserRepository, hasher: AsyncPasswordHasher, token_service: TokenService):
         self.repo = repo
         self.hasher = hasher
         self.token_service = token_service
 
     async def execute(self, username: str, password: str) -> str:
-        user = await self.repo.by_username(username)
+        user = await self.repo.credentials_by_username(username)
         if not user:
             raise ValueError("User not found")
 
+        if not await self.hasher.verify(password, user.password_hash):
+            raise ValueError("Invalid password")
+
         if self.hasher.needs_rehash(user.password_hash):
-            user.password_hash = self.hasher.hash(password)
-            await self.repo.update(user)
+            await self.repo.update_password_hash(user.id, await self.hasher.hash(password))
 
         access_token = self.token_service.issue_access(user, ["me:read"])
         return {"access_token": access_token, "token_type": "Bearer"}
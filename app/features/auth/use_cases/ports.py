@@ -1,6 +1,10 @@
 from typing import List, Optional, Protocol
 
-from app.features.auth.entities.user import User
+from app.features.auth.entities.user import User, UserCredentials
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the password hashing pool has no free slot for a new job."""
 
 
 class PasswordHasher(Protocol):
@@ -9,8 +13,14 @@ class PasswordHasher(Protocol):
     def needs_rehash(self, hashed: str) -> bool: ...
 
 
+class AsyncPasswordHasher(Protocol):
+    async def hash(self, raw: str) -> str: ...
+    async def verify(self, raw: str, hashed: str) -> bool: ...
+    def needs_rehash(self, hashed: str) -> bool: ...
+
+
 class TokenService(Protocol):
-    def issue_access(self, user: User, scopes: List[str] | None = None) -> str: ...
+    def issue_access(self, user: User | UserCredentials, scopes: List[str] | None = None) -> str: ...
     def parse(self, token: str) -> Optional[User]: ...
 
 
@@ -18,5 +28,8 @@ class UserRepository(Protocol):
     async def by_id(self, user_id: str) -> Optional[User]: ...
     async def by_email(self, email: str) -> Optional[User]: ...
     async def by_username(self, username: str) -> Optional[User]: ...
+    async def credentials_by_username(self, username: str) -> Optional[UserCredentials]: ...
+    async def credentials_by_email(self, email: str) -> Optional[UserCredentials]: ...
     async def save(self, u: User) -> User: ...
     async def update(self, u: User) -> User: ...
+    async def update_password_hash(self, user_id: str, password_hash: str) -> None: ...
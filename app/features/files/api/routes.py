@@ -0,0 +1,67 @@
+# app/features/files/api/routes.py
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.features.auth.entities.user import User
+from app.features.files.api.schemas import FileOut, PresignIn, PresignOut, UploadCompleteIn, UploadIn, UploadOut
+from app.platform.config import storage_settings
+from app.platform.fastapi.dependencies import get_current_user
+from app.utils.minio_client import MinioClient, get_minio_client
+from app.utils.responses import present
+
+router = APIRouter(prefix="/files", tags=["files"])
+
+
+def check_owned(user: User, object_names: List[str]) -> None:
+    """Presigned access is limited to the caller's own ``<PRESIGNED_USER_PREFIX>/<user id>/`` prefix."""
+    prefix = f"{storage_settings.PRESIGNED_USER_PREFIX}/{user.id}/"
+    for object_name in object_names:
+        segments = object_name[len(prefix) :].split("/")
+        if not object_name.startswith(prefix) or any(segment in ("", ".", "..") for segment in segments):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Object '{object_name}' is outside your files",
+            )
+
+
+@router.post("/presign", response_model=PresignOut)
+async def presign(
+    body: PresignIn,
+    user: User = Depends(get_current_user),
+    client: MinioClient = Depends(get_minio_client),
+):
+    """Sign download URLs for many of the caller's objects in one call."""
+    check_owned(user, body.object_names)
+    expires = body.expires or storage_settings.PRESIGNED_GET_EXPIRES
+    urls = await client.presigned_urls(body.object_names, expires)
+    return present(PresignOut.model_construct(expires=expires, urls=urls))
+
+
+@router.post("/uploads", response_model=UploadOut)
+async def create_upload(
+    body: UploadIn,
+    user: User = Depends(get_current_user),
+    client: MinioClient = Depends(get_minio_client),
+):
+    """POST policy for uploading one object straight to MinIO, size-limited to MAX_UPLOAD_SIZE."""
+    check_owned(user, [body.object_name])
+    expires = body.expires or storage_settings.PRESIGNED_UPLOAD_EXPIRES
+    upload = await client.presigned_upload(body.object_name, expires)
+    return present(UploadOut.model_construct(url=upload["url"], fields=upload["fields"], expires=expires))
+
+
+@router.post("/uploads/complete", response_model=FileOut)
+async def complete_upload(
+    body: UploadCompleteIn,
+    user: User = Depends(get_current_user),
+    client: MinioClient = Depends(get_minio_client),
+):
+    """Called after the direct upload: validates the object and drops stale cached copies."""
+    check_owned(user, [body.object_name])
+    info = await client.complete_upload(body.object_name)
+    return present(
+        FileOut.model_construct(
+            object_name=body.object_name, size=info["size"], content_type=info["content_type"], etag=info["etag"]
+        )
+    )
@@ -0,0 +1,37 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.platform.config import storage_settings
+
+
+class PresignIn(BaseModel):
+    object_names: List[str] = Field(min_length=1, max_length=storage_settings.PRESIGNED_BATCH_MAX)
+    expires: Optional[int] = Field(default=None, ge=1, le=7 * 24 * 3600)
+
+
+class PresignOut(BaseModel):
+    expires: int
+    urls: Dict[str, str]
+
+
+class UploadIn(BaseModel):
+    object_name: str
+    expires: Optional[int] = Field(default=None, ge=1, le=7 * 24 * 3600)
+
+
+class UploadOut(BaseModel):
+    url: str
+    fields: Dict[str, str]
+    expires: int
+
+
+class UploadCompleteIn(BaseModel):
+    object_name: str
+
+
+class FileOut(BaseModel):
+    object_name: str
+    size: int
+    content_type: str
+    etag: str
@@ -1,4 +1,7 @@
-from typing import List
+import hashlib
+import os
+import tempfile
+from typing import Any, Dict, List
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -6,6 +9,21 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from app.utils.system import get_optimal_workers
 
 
+def _default_workers() -> int:
+    # Each worker also reserves its password hashing budget; security settings are built
+    # by the time AppSettings is instantiated in app.platform.config
+    from app.platform.config import get_security_settings
+
+    return get_optimal_workers(get_security_settings().PASSWORD_HASH_MEMORY_BUDGET_MB)
+
+
+def _default_metrics_dir(data: Dict[str, Any]) -> str:
+    # One directory per deployment (checkout and port), so deployments sharing a host never merge metrics
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    digest = hashlib.blake2b(f"{root}:{data['PORT']}".encode(), digest_size=8).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"app-metrics-{digest}")
+
+
 class AppSettings(BaseSettings):
     """Application settings."""
 
@@ -19,7 +37,7 @@ class AppSettings(BaseSettings):
     DEBUG: bool = Field(default=False)
     HOST: str = Field(default="127.0.0.1")
     PORT: int = Field(default=8000)
-    WORKERS: int = Field(default=get_optimal_workers())
+    WORKERS: int = Field(default_factory=_default_workers)
     LOG_LEVEL: str = Field(default="info")
     LOOP: str = Field(default="uvloop")
     HTTP: str = Field(default="httptools")
@@ -30,10 +48,21 @@ class AppSettings(BaseSettings):
     LIMIT_MAX_REQUESTS: int | None = Field(default=None)
     TIMEOUT_KEEP_ALIVE: int = Field(default=5)
     H11_MAX_INCOMPLETE_EVENT_SIZE: int = Field(default=16 * 1024)
+    SERIALIZER_MAX_DEPTH: int = Field(default=2)  # relationship levels emitted by app.utils.serializers
+
+    # Response compression (zstd/br/gzip)
+    COMPRESSION_MINIMUM_SIZE: int = Field(default=1000)
+    COMPRESSION_OFFLOAD_SIZE: int = Field(default=256 * 1024)  # bodies this large compress in the threadpool
+
+    # Metrics (/metrics, prometheus_client multiprocess mode; PROMETHEUS_MULTIPROC_DIR overrides METRICS_DIR)
+    METRICS_ENABLED: bool = Field(default=True)
+    METRICS_TOKEN: str | None = Field(default=None)  # bearer token for /metrics; unset = endpoint always 403
+    METRICS_DIR: str = Field(default_factory=_default_metrics_dir)
+    METRICS_SYNC_INTERVAL: int = Field(default=5)  # seconds between pool/cache stats snapshots
 
     # Headers
-    SERVER_HEADER: str = Field(default=None)
-    FORWARDED_ALLOW_IPS: str = Field(default="*")
+    SERVER_HEADER: str | None = Field(default=None)
+    FORWARDED_ALLOW_IPS: str = Field(default="127.0.0.1")
     DATE_HEADER: bool = Field(default=True)
 
     # CORS
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,6 +10,14 @@ class DatabaseSettings(BaseSettings):
     # Database URL
     DATABASE_URL: str
 
+    # Read replicas (JSON list of URLs); read-only use cases are routed to them
+    DATABASE_REPLICA_URLS: List[str] = Field(default=[])
+    REPLICA_BALANCING: str = Field(default="round_robin")  # "round_robin" or "least_connections"
+    REPLICA_MAX_LAG: float = Field(default=5.0)  # seconds; lagging replicas fall back to the primary
+    REPLICA_LAG_CHECK_INTERVAL: int = Field(default=5)
+    REPLICA_LAG_CHECK_TIMEOUT: float = Field(default=2.0)  # a check slower than this marks the replica unhealthy
+    READ_YOUR_WRITES_WINDOW: float = Field(default=5.0)  # seconds a written key stays pinned to the primary
+
     # Connection Pool Settings
     POOL_SIZE: int = Field(default=5)
     MAX_OVERFLOW: int = Field(default=10)
@@ -15,5 +25,26 @@ class DatabaseSettings(BaseSettings):
     POOL_RECYCLE: int = Field(default=3600)
     ECHO_SQL: bool = Field(default=False)
 
+    # Connection budget for the whole server (all workers); unset = POOL_SIZE/MAX_OVERFLOW per worker
+    POOL_TOTAL_CONNECTIONS: int | None = Field(default=None)
+    POOL_WARMUP: bool = Field(default=True)  # open POOL_SIZE connections before accepting traffic
+
+    # Idle shrinking: after POOL_IDLE_TIMEOUT seconds without checkouts keep only POOL_MIN_IDLE connections
+    POOL_IDLE_SHRINK: bool = Field(default=False)
+    POOL_IDLE_TIMEOUT: int = Field(default=300)
+    POOL_IDLE_CHECK_INTERVAL: int = Field(default=30)
+    POOL_MIN_IDLE: int = Field(default=1)
+
+    # Batched lookups (app.utils.dataloader)
+    BATCH_LOAD_MAX_SIZE: int = Field(default=100)
+    BATCH_LOAD_WINDOW_MS: float = Field(default=0)  # 0 = same event-loop tick
+
+    # Per-request SQL statistics (Server-Timing header, log line past the thresholds)
+    SQL_STATS_SAMPLE_RATE: float = Field(default=0.1)  # fraction of requests instrumented, 0 disables
+    SQL_STATS_SERVER_TIMING: bool = Field(default=True)
+    SQL_STATS_SLOW_MS: float = Field(default=200)
+    SQL_STATS_MAX_QUERIES: int = Field(default=20)
+    SQL_STATS_REPEAT_THRESHOLD: int = Field(default=5)  # same statement this often in one request = likely N+1
+
     # Settings config
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=True)
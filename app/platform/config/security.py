@@ -12,6 +12,8 @@ class SecuritySettings(BaseSettings):
     ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7)
+    TOKEN_CACHE_SIZE: int = Field(default=10000)  # verified tokens kept per worker, 0 disables
+    TOKEN_CACHE_TTL: int = Field(default=300)  # seconds, never beyond the token's exp
 
     # Password Settings
     PASSWORD_MIN_LENGTH: int = Field(default=8)
@@ -21,6 +23,18 @@ class SecuritySettings(BaseSettings):
     PASSWORD_REQUIRE_DIGITS: bool = Field(default=True)
     PASSWORD_REQUIRE_SPECIAL: bool = Field(default=True)
 
+    # Password Hashing Pool
+    PASSWORD_HASH_EXECUTOR: str = Field(default="thread")  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = Field(default=2)
+    PASSWORD_HASH_QUEUE_SIZE: int = Field(default=32)
+    PASSWORD_HASH_MEMORY_BUDGET_MB: int = Field(default=256)  # per worker process
+
+    # Argon2 parameters, see `python -m app.features.auth.adapters.crypto.calibrate`.
+    # Changing them migrates stored hashes on next successful login.
+    ARGON2_TIME_COST: int = Field(default=2)
+    ARGON2_MEMORY_COST: int = Field(default=102400)  # KiB
+    ARGON2_PARALLELISM: int = Field(default=8)
+
     # Rate Limiting
     RATE_LIMIT_PER_SECOND: int = Field(default=10)
     RATE_LIMIT_BURST: int = Field(default=20)
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from typing import List, Optional
 
 from pydantic import Field
@@ -14,6 +16,14 @@ class StorageSettings(BaseSettings):
     MINIO_SECURE: Optional[bool] = False
     MINIO_BUCKET_NAME: Optional[str] = Field(default="sips")
     MINIO_REGION: Optional[str] = Field(default=None)
+    # Base URL clients reach MinIO at, used as the host of presigned URLs (defaults to MINIO_ENDPOINT_URL)
+    MINIO_PUBLIC_URL: Optional[str] = Field(default=None)
+
+    # HTTP pool of the per-worker MinIO client (kept-alive connections are reused across requests)
+    MINIO_POOL_SIZE: int = Field(default=32)
+    MINIO_KEEPALIVE_TIMEOUT: int = Field(default=60)
+    MINIO_CONNECT_TIMEOUT: int = Field(default=5)
+    MINIO_READ_TIMEOUT: int = Field(default=300)
 
     # Upload Settings
     MAX_UPLOAD_SIZE: int = Field(default=100 * 1024 * 1024)  # 100MB default limit
@@ -33,9 +43,40 @@ class StorageSettings(BaseSettings):
         "json",
     ]
 
+    # Streaming uploads: parts of UPLOAD_PART_SIZE (S3 minimum 5MB), at most UPLOAD_CONCURRENCY in flight
+    UPLOAD_PART_SIZE: int = Field(default=8 * 1024 * 1024)
+    UPLOAD_CONCURRENCY: int = Field(default=4)
+
+    # Downloads: chunks between the MIN/MAX sizes, adapted to how fast the client reads;
+    # bodies of DOWNLOAD_PARALLEL_THRESHOLD or more are fetched as concurrent ranged parts
+    DOWNLOAD_MIN_CHUNK: int = Field(default=64 * 1024)
+    DOWNLOAD_MAX_CHUNK: int = Field(default=1024 * 1024)
+    DOWNLOAD_PARALLEL_THRESHOLD: int = Field(default=64 * 1024 * 1024)
+    DOWNLOAD_PART_SIZE: int = Field(default=8 * 1024 * 1024)
+    DOWNLOAD_CONCURRENCY: int = Field(default=4)
+
+    # Presigned URLs: clients transfer file bytes straight to/from MinIO instead of through the workers
+    MINIO_PRESIGNED: bool = Field(default=False)  # get_file_url returns presigned GET URLs instead of public ones
+    PRESIGNED_GET_EXPIRES: int = Field(default=3600)
+    PRESIGNED_UPLOAD_EXPIRES: int = Field(default=900)  # POST policies, limited to MAX_UPLOAD_SIZE
+    PRESIGNED_USER_PREFIX: str = Field(default="users")  # /files endpoints only sign "<prefix>/<user id>/..."
+    PRESIGNED_CACHE_TTL: int = Field(default=60)  # signatures reused for this long, capped at half the expiry
+    PRESIGNED_CACHE_SIZE: int = Field(default=10000)
+    PRESIGNED_BATCH_MAX: int = Field(default=200)
+
+    # Local disk cache of hot objects, shared by the workers; OBJECT_CACHE_MAX_BYTES bounds the whole directory
+    OBJECT_CACHE_ENABLED: bool = Field(default=True)
+    OBJECT_CACHE_DIR: str = Field(default_factory=lambda: os.path.join(tempfile.gettempdir(), "app-object-cache"))
+    OBJECT_CACHE_MAX_BYTES: int = Field(default=1024 * 1024 * 1024)
+    OBJECT_CACHE_MAX_OBJECT_SIZE: int = Field(default=32 * 1024 * 1024)
+    OBJECT_CACHE_REVALIDATE: int = Field(default=30)  # seconds a known ETag is trusted before a HEAD
+
     # Cache Settings
     CACHE_CONTROL: str = Field(default="max-age=3600")
     CACHE_EXPIRES: int = Field(default=3600)  # 1 hour
+    # The response cache (@cache_response) needs the shared L2 cache to invalidate across workers;
+    # set this to use it with the per-worker L1 only, which is safe with a single worker
+    RESPONSE_CACHE_LOCAL: bool = Field(default=False)
 
     # Settings config
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=True)
@@ -1,18 +1,379 @@
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Hashable, List, Optional, Tuple
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import greenlet_spawn
 
 from app.platform.config import app_settings, db_settings
+from app.utils.cache import cache
 
-# Create async engine
-engine = create_async_engine(
-    db_settings.DATABASE_URL,
-    echo=app_settings.DEBUG,
-    pool_pre_ping=True,
-    pool_recycle=db_settings.POOL_RECYCLE,
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time and can release idle connections."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.last_checkout = time.monotonic()
+
+    def _do_get(self):
+        started = time.monotonic()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            self.last_checkout = time.monotonic()
+
+    def shrink(self, keep: int) -> int:
+        """Close idle pooled connections until at most ``keep`` remain. Run via greenlet_spawn."""
+        closed = 0
+        while self.checkedin() > keep:
+            try:
+                record = self._pool.get(False)
+            except Exception:
+                break
+            try:
+                record.close()
+            finally:
+                self._dec_overflow()
+            closed += 1
+        return closed
+
+
+def worker_pool_budget(total: int | None, workers: int, pool_size: int, max_overflow: int) -> Tuple[int, int]:
+    """Split a global connection budget across worker processes.
+
+    Without a budget the configured POOL_SIZE/MAX_OVERFLOW apply per worker, so the
+    server may open ``workers * (pool_size + max_overflow)`` connections in total.
+    """
+    if not total:
+        return pool_size, max_overflow
+    per_worker = max(1, total // max(1, workers))
+    size = max(1, min(pool_size, per_worker))
+    return size, max(0, min(max_overflow, per_worker - size))
+
+
+class QueryStats:
+    """SQL statements executed while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        # Bound parameters are placeholders in the statement text, so a loop of lookups shares one shape
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+# Set by QueryStatsMiddleware for sampled requests; None means the hooks do nothing
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if query_stats.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = query_stats.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument(target: AsyncEngine) -> AsyncEngine:
+    """Attach the per-request query statistics hooks to an engine."""
+    event.listen(target.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return target
+
+
+def build_engine(url: str) -> AsyncEngine:
+    options: Dict[str, Any] = {
+        "echo": db_settings.ECHO_SQL or app_settings.DEBUG,
+        "pool_pre_ping": True,
+        "pool_recycle": db_settings.POOL_RECYCLE,
+    }
+    # SQLite uses its own single-connection pools; sizing only applies to server databases.
+    if make_url(url).get_backend_name() != "sqlite":
+        pool_size, max_overflow = worker_pool_budget(
+            db_settings.POOL_TOTAL_CONNECTIONS, app_settings.WORKERS, db_settings.POOL_SIZE, db_settings.MAX_OVERFLOW
+        )
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=db_settings.POOL_TIMEOUT,
+        )
+    return instrument(create_async_engine(url, **options))
+
+
+def pool_stats(target: AsyncEngine | None = None) -> Dict[str, Any]:
+    """Live pool statistics for the given engine (defaults to the app engine)."""
+    pool = (target or engine).pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "wait_total_ms": pool.wait_total * 1000,
+        "wait_avg_ms": (pool.wait_total / pool.checkouts * 1000) if pool.checkouts else 0.0,
+        "wait_max_ms": pool.wait_max * 1000,
+    }
+
+
+async def shrink_idle_connections(target: AsyncEngine | None = None) -> None:
+    """Background task: release idle connections after POOL_IDLE_TIMEOUT seconds without checkouts."""
+    target = target or engine
+    while True:
+        await asyncio.sleep(db_settings.POOL_IDLE_CHECK_INTERVAL)
+        pool = target.pool
+        if not isinstance(pool, InstrumentedQueuePool):
+            continue
+        if pool.checkedout() == 0 and time.monotonic() - pool.last_checkout >= db_settings.POOL_IDLE_TIMEOUT:
+            closed = await greenlet_spawn(pool.shrink, db_settings.POOL_MIN_IDLE)
+            if closed:
+                logger.info(f"Closed {closed} idle database connection(s)")
+
+
+async def warm_up(target: AsyncEngine) -> int:
+    """Open the pool's base connections up front so the first requests don't pay for connecting."""
+    size = target.pool.size() if isinstance(target.pool, InstrumentedQueuePool) else 1
+
+    # Check out `size` connections at once (so each is a distinct one), then return them to the pool.
+    connections = [target.connect() for _ in range(size)]
+    results = await asyncio.gather(*(connection.start() for connection in connections), return_exceptions=True)
+    for connection in connections:
+        if connection.sync_connection is not None:
+            await connection.close()
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise errors[0]
+    return size
+
+
+class EngineRegistry:
+    """Single owner of the process's database engines.
+
+    Engines are created lazily by name (``primary`` is DATABASE_URL) and shared by
+    request sessions, the ``db`` middleware proxy, health checks and migrations.
+    The FastAPI lifespan calls ``start()`` to warm the pools before traffic and
+    ``dispose()`` on shutdown.
+    """
+
+    def __init__(self):
+        self._urls: Dict[str, str] = {"primary": db_settings.DATABASE_URL}
+        self._engines: Dict[str, AsyncEngine] = {}
+
+    def register(self, name: str, url: str) -> None:
+        self._urls[name] = url
+
+    def get(self, name: str = "primary") -> AsyncEngine:
+        if name not in self._engines:
+            self._engines[name] = build_engine(self._urls[name])
+        return self._engines[name]
+
+    def engines(self) -> Dict[str, AsyncEngine]:
+        return {name: self.get(name) for name in self._urls}
+
+    async def start(self, warm: bool = True) -> None:
+        if not warm:
+            return
+        for name, target in self.engines().items():
+            # A cold pool only costs the first requests some latency; never fail startup over it
+            try:
+                opened = await warm_up(target)
+            except Exception as e:
+                logger.warning(f"Could not warm up '{name}' database engine: {e!r}")
+                continue
+            logger.info(f"Warmed up {opened} connection(s) for '{name}' database engine")
+
+    async def dispose(self) -> None:
+        for target in self._engines.values():
+            await target.dispose()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool_stats(target) for name, target in self._engines.items()}
+
+
+_LAG_QUERIES = {
+    # Caught up when everything received was replayed: the last replay timestamp keeps
+    # aging while the primary is idle, so it only measures lag while WAL is pending
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    ),
+    "mysql": "SHOW REPLICA STATUS",
+}
+
+
+class ReplicaRouter:
+    """Chooses the engine for read-only work.
+
+    Replicas are balanced round-robin or by fewest checked-out connections. A replica
+    whose measured lag exceeds ``max_lag`` (or whose lag check fails) is skipped until
+    it catches up; with no healthy replica, reads go to the primary. Replicas start
+    unhealthy and only take reads once ``monitor`` has measured them. Keys passed to
+    ``mark_write`` (e.g. a user id) stay pinned to the primary for ``window`` seconds
+    so a client reads its own writes. ``mark_write`` and ``pick`` track the window per
+    worker; ``pin`` and ``pick_consistent`` also share it through the ``shared`` cache
+    backend, so a read on any worker sees the write.
+    """
+
+    def __init__(
+        self,
+        registry: EngineRegistry,
+        names: List[str],
+        balancing: str,
+        max_lag: float,
+        window: float,
+        shared=None,
+    ):
+        self.registry = registry
+        self.names = names
+        self.balancing = balancing
+        self.max_lag = max_lag
+        self.window = window
+        self.shared = shared
+        self.lag: Dict[str, float] = dict.fromkeys(names, float("inf"))
+        self._cycle = itertools.cycle(names) if names else None
+        self._written: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._stats = {"replica_reads": 0, "primary_reads": 0, "pinned_reads": 0}
+
+    def healthy(self) -> List[str]:
+        return [name for name in self.names if self.lag[name] <= self.max_lag]
+
+    def mark_write(self, key: Hashable) -> None:
+        self._written[key] = time.monotonic() + self.window
+        self._written.move_to_end(key)
+        while self._written and next(iter(self._written.values())) <= time.monotonic():
+            self._written.popitem(last=False)
+
+    def pinned(self, key: Hashable) -> bool:
+        deadline = self._written.get(key)
+        return deadline is not None and deadline > time.monotonic()
+
+    async def pin(self, key: Hashable) -> None:
+        """``mark_write`` on this worker and, through ``shared``, on every other one."""
+        self.mark_write(key)
+        if self.shared is not None:
+            await self.shared.set(f"replica:pin:{key}", b"1", ttl=math.ceil(self.window))
+
+    async def pick_consistent(self, *keys: Hashable) -> AsyncEngine:
+        """``pick``, also honouring keys pinned by other workers."""
+        if self.shared is not None and self.healthy() and not any(self.pinned(key) for key in keys):
+            pins = await asyncio.gather(*(self.shared.get(f"replica:pin:{key}") for key in keys))
+            if any(pin is not None for pin in pins):
+                self._stats["pinned_reads"] += 1
+                return self.registry.get()
+        return self.pick(*keys)
+
+    def pick(self, *keys: Hashable) -> AsyncEngine:
+        if any(self.pinned(key) for key in keys):
+            self._stats["pinned_reads"] += 1
+            return self.registry.get()
+
+        healthy = self.healthy()
+        if not healthy:
+            self._stats["primary_reads"] += 1
+            return self.registry.get()
+
+        self._stats["replica_reads"] += 1
+        if self.balancing == "least_connections":
+            return min((self.registry.get(name) for name in healthy), key=lambda e: e.pool.checkedout())
+        for _ in self.names:
+            name = next(self._cycle)
+            if name in healthy:
+                return self.registry.get(name)
+        return self.registry.get()
+
+    async def measure_lag(self, name: str) -> float:
+        async with asyncio.timeout(db_settings.REPLICA_LAG_CHECK_TIMEOUT):
+            return await self._measure_lag(name)
+
+    async def _measure_lag(self, name: str) -> float:
+        target = self.registry.get(name)
+        query = _LAG_QUERIES.get(target.dialect.name)
+        if query is None:
+            return 0.0
+        async with target.connect() as connection:
+            result = await connection.execute(text(query))
+            if target.dialect.name == "postgresql":
+                return float(result.scalar() or 0)
+            row = result.mappings().first()
+            if row is None:
+                return float("inf")
+            lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+            return float("inf") if lag is None else float(lag)
+
+    async def monitor(self, interval: float) -> None:
+        """Background task refreshing replica lag every ``interval`` seconds."""
+        while True:
+            for name in self.names:
+                try:
+                    self.lag[name] = await self.measure_lag(name)
+                except Exception as e:
+                    logger.warning(f"Replica '{name}' lag check failed: {e!r}")
+                    self.lag[name] = float("inf")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "lag": dict(self.lag), "healthy": self.healthy()}
+
+
+engine_registry = EngineRegistry()
+for index, replica_url in enumerate(db_settings.DATABASE_REPLICA_URLS):
+    engine_registry.register(f"replica-{index}", replica_url)
+
+replica_router = ReplicaRouter(
+    engine_registry,
+    [f"replica-{index}" for index in range(len(db_settings.DATABASE_REPLICA_URLS))],
+    balancing=db_settings.REPLICA_BALANCING,
+    max_lag=db_settings.REPLICA_MAX_LAG,
+    window=db_settings.READ_YOUR_WRITES_WINDOW,
+    shared=cache.l2,
 )
 
+# Primary engine, kept as a module attribute for existing imports
+engine = engine_registry.get()
+
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
     engine,
@@ -31,6 +392,27 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def read_session(*consistency_keys: Hashable) -> AsyncSession:
+    """Session for read-only work, bound to a replica unless a key was written recently.
+
+    Writes and read-your-writes flows must use ``get_session`` (the primary).
+    """
+    return AsyncSession(bind=replica_router.pick(*consistency_keys), expire_on_commit=False, autoflush=False)
+
+
+@asynccontextmanager
+async def consistent_read_session(*consistency_keys: Hashable) -> AsyncIterator[AsyncSession]:
+    """``read_session`` that also stays on the primary for keys written on other workers."""
+    target = await replica_router.pick_consistent(*consistency_keys)
+    async with AsyncSession(bind=target, expire_on_commit=False, autoflush=False) as session:
+        yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    async with read_session() as session:
+        yield session
+
+
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         return session
@@ -1,27 +1,55 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from aiomysql import IntegrityError as ForeignKeyViolationError
-from brotli_asgi import BrotliMiddleware
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi_async_sqlalchemy import SQLAlchemyMiddleware
-from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from sqlalchemy.exc import IntegrityError
 
 from app.api.v1 import router as api_router
 from app.core.config import settings
 from app.core.exceptions import APIException, prepare_error_response
-from app.utils.limiter import limiter
+from app.features.auth.api.deps import shutdown_password_hasher
+from app.features.files.api.routes import router as files_router
+from app.platform.config import app_settings, db_settings
+from app.platform.db.engine import engine_registry, replica_router, shrink_idle_connections
+from app.platform.fastapi.metrics import RATE_LIMITED, collect_runtime_metrics, route_label
+from app.platform.fastapi.metrics import router as metrics_router
+from app.platform.fastapi.middleware import CompressionMiddleware, MetricsMiddleware, QueryStatsMiddleware
+from app.utils.cache import cache
+from app.utils.limiter import limiter, rate_limit_headers
+from app.utils.minio_client import minio_client
+from app.utils.object_cache import object_cache
+from app.utils.responses import ORJSONResponse
 from app.utils.system import optimize_system
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await optimize_system()
+    await engine_registry.start(warm=db_settings.POOL_WARMUP)
+    await cache.start()
+    await minio_client.start()
+    await object_cache.start()
+    background = []
+    if db_settings.POOL_IDLE_SHRINK:
+        background.append(asyncio.create_task(shrink_idle_connections()))
+    if replica_router.names:
+        background.append(asyncio.create_task(replica_router.monitor(db_settings.REPLICA_LAG_CHECK_INTERVAL)))
+    if app_settings.METRICS_ENABLED:
+        background.append(asyncio.create_task(collect_runtime_metrics(app_settings.METRICS_SYNC_INTERVAL)))
     yield
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await minio_client.close()
+    await cache.close()
+    await engine_registry.dispose()
+    shutdown_password_hasher()
 
 
 app = FastAPI(
@@ -36,7 +64,6 @@ app = FastAPI(
     openapi_url="/openapi.json",
 )
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 app.add_middleware(
     CORSMiddleware,
@@ -47,36 +74,49 @@ app.add_middleware(
 )
 app.add_middleware(
     SQLAlchemyMiddleware,
-    db_url=settings.DATABASE_URL,
-    engine_args={"echo": settings.DEBUG},
-)
-app.add_middleware(
-    BrotliMiddleware,
-    minimum_size=1000,
+    custom_engine=engine_registry.get(),
 )
+app.add_middleware(CompressionMiddleware)
+if db_settings.SQL_STATS_SAMPLE_RATE > 0:
+    app.add_middleware(QueryStatsMiddleware, sample_rate=db_settings.SQL_STATS_SAMPLE_RATE)
+if app_settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router)
+app.include_router(files_router)
+if app_settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exception_handler(request: Request, exc: RateLimitExceeded):
+    RATE_LIMITED.labels(route_label(request.scope)).inc()
+    return ORJSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"error": f"Rate limit exceeded: {exc.detail}"},
+        headers=rate_limit_headers(request),
+    )
 
 
 @app.exception_handler(APIException)
 async def api_exception_handler(request: Request, exc: APIException):
     response_content = prepare_error_response(message=exc.message)
 
-    return JSONResponse(status_code=exc.status_code, content=response_content, headers=exc.headers)
+    return ORJSONResponse(status_code=exc.status_code, content=response_content, headers=exc.headers)
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     response_content = prepare_error_response(message=str(exc.detail))
 
-    return JSONResponse(status_code=exc.status_code, content=response_content, headers=exc.headers)
+    return ORJSONResponse(status_code=exc.status_code, content=response_content, headers=exc.headers)
 
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     response_content = prepare_error_response(message=exc.errors())
 
-    return JSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content=response_content)
+    return ORJSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content=response_content)
 
 
 @app.exception_handler(LookupError)
@@ -88,7 +128,7 @@ async def enum_exception_handler(request: Request, exc: LookupError):
             message="Invalid enum value",
             detail=error_message,
         )
-        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=response_content)
+        return ORJSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=response_content)
 
     raise exc
 
@@ -101,7 +141,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         detail=str(exc) if settings.DEBUG else None,
     )
 
-    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=response_content)
+    return ORJSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=response_content)
 
 
 @app.exception_handler(Exception)
@@ -110,4 +150,4 @@ async def global_exception_handler(request: Request, exc: Exception):
         message="Internal server error", detail=str(exc) if settings.DEBUG else None
     )
 
-    return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=response_content)
+    return ORJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=response_content)
@@ -0,0 +1,159 @@
+import functools
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+
+from app.features.auth.api.deps import get_token_service
+from app.platform.config import storage_settings
+from app.utils import http_cache
+from app.utils.compression import ENCODINGS, negotiate
+from app.utils.params import CommonParams
+
+# Name of the Request parameter CachedRoute adds to a cached endpoint's signature
+_REQUEST_PARAM = "_response_cache_request"
+
+
+@dataclass(frozen=True)
+class ResponseCachePolicy:
+    ttl: int
+    tags: Tuple[str, ...]
+    scope: Literal["user", "public"]
+    cache_control: str
+
+
+def cache_response(
+    ttl: Optional[int] = None,
+    tags: Sequence[str] = (),
+    scope: Literal["user", "public"] = "user",
+    cache_control: Optional[str] = None,
+) -> Callable:
+    """Opt a GET endpoint into the response cache; its router must use ``route_class=CachedRoute``.
+
+    ``scope="user"`` keys entries on the bearer token's subject and scopes (anonymous
+    requests are not cached); ``"public"`` shares them between callers. Writes call
+    ``http_cache.invalidate_tags`` with the same ``tags`` to drop stale entries.
+    Caching is only active when ``http_cache.enabled()`` (a shared L2 is configured).
+    """
+    if cache_control is None:
+        cache_control = storage_settings.CACHE_CONTROL
+        if scope == "user":
+            cache_control = f"private, {cache_control}"
+    policy = ResponseCachePolicy(ttl or storage_settings.CACHE_EXPIRES, tuple(tags), scope, cache_control)
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__response_cache__ = policy
+        return endpoint
+
+    return decorator
+
+
+def _principal(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = get_token_service().parse(token)
+    if not payload or "sub" not in payload:
+        return None
+    return f"{payload['sub']}|{','.join(sorted(payload.get('scopes', [])))}"
+
+
+def _cached_response(
+    request: Request,
+    entry: http_cache.CachedResponse,
+    policy: ResponseCachePolicy,
+    background: Optional[BackgroundTask] = None,
+) -> Response:
+    available = tuple(encoding for encoding in ENCODINGS if encoding in entry.bodies)
+    encoding = negotiate(request.headers.get("accept-encoding"), available) or "identity"
+    headers = {
+        "ETag": entry.etag_for(encoding),
+        "Cache-Control": policy.cache_control,
+        "Vary": "Accept-Encoding, Authorization" if policy.scope == "user" else "Accept-Encoding",
+    }
+    if entry.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers, background=background)
+
+    response = Response(entry.bodies[encoding], headers=headers, background=background)
+    response.raw_headers.extend((name.encode("latin-1"), value.encode("latin-1")) for name, value in entry.headers)
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def _looked_up_first(endpoint: Callable, policy: ResponseCachePolicy) -> Callable:
+    """Wrap ``endpoint`` so the cache is checked after its dependencies (auth included) were solved."""
+    is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        request: Request = kwargs.pop(_REQUEST_PARAM)
+        principal = _principal(request) if policy.scope == "user" else "public"
+        if principal is not None and http_cache.enabled():
+            key = await http_cache.cache_key(
+                [request.scope["route"].path_format, CommonParams.normalize_query(request.query_params), principal],
+                policy.tags,
+            )
+            entry = await http_cache.get(key)
+            if entry is not None:
+                return _cached_response(request, entry, policy)
+            # Picked up by CachedRoute once the endpoint's response is rendered
+            request.state.response_cache_key = key
+        if is_coroutine:
+            return await endpoint(*args, **kwargs)
+        return await run_in_threadpool(endpoint, *args, **kwargs)
+
+    signature = inspect.signature(endpoint)
+    parameters = list(signature.parameters.values())
+    request_param = inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+    if parameters and parameters[-1].kind is inspect.Parameter.VAR_KEYWORD:
+        parameters.insert(-1, request_param)
+    else:
+        parameters.append(request_param)
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    wrapper.__response_cache_wrapped__ = True
+    return wrapper
+
+
+class CachedRoute(APIRoute):
+    """APIRoute that serves ``@cache_response`` endpoints from app.utils.http_cache.
+
+    The lookup runs inside the endpoint call, after every dependency was solved, so
+    authentication and role checks still reject a disabled or demoted user on a hit.
+    A hit is answered from the stored body (pre-compressed for the negotiated
+    encoding) and a matching If-None-Match gets a 304, without running the handler.
+    Only plain ``Response`` bodies are stored; streaming and file responses pass through.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any):
+        self.response_cache: Optional[ResponseCachePolicy] = getattr(endpoint, "__response_cache__", None)
+        # include_router builds the route again from the already wrapped endpoint
+        if self.response_cache is not None and not getattr(endpoint, "__response_cache_wrapped__", False):
+            endpoint = _looked_up_first(endpoint, self.response_cache)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        policy = self.response_cache
+        if policy is None:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            response = await handler(request)
+            key = getattr(request.state, "response_cache_key", None)
+            if (
+                key is None
+                or response.status_code != 200
+                or not isinstance(getattr(response, "body", None), bytes)
+                or "set-cookie" in response.headers
+            ):
+                return response
+            entry = await http_cache.build(response.body, response.headers.items())
+            await http_cache.put(key, entry, policy.ttl)
+            return _cached_response(request, entry, policy, background=response.background)
+
+        return cached_handler
@@ -3,7 +3,7 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 
-from app.features.auth.api.deps import get_token_service, get_user_repo
+from app.features.auth.api.deps import get_read_user_repo, get_token_service
 from app.features.auth.entities.user import User
 from app.features.auth.use_cases.ports import TokenService, UserRepository
 
@@ -13,7 +13,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     tokens: TokenService = Depends(get_token_service),
-    repo: UserRepository = Depends(get_user_repo),
+    repo: UserRepository = Depends(get_read_user_repo),
 ) -> User:
     claims = tokens.parse(token)
     if not claims:
@@ -0,0 +1,110 @@
+import asyncio
+import hmac
+import logging
+from typing import Dict, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from starlette.concurrency import run_in_threadpool
+from starlette.types import Scope
+
+from app.features.auth.api.deps import get_token_service
+from app.platform.config import app_settings
+from app.platform.db.engine import engine_registry
+from app.utils import metrics as prometheus
+from app.utils.cache import cache
+from app.utils.metrics import Counter, Gauge, Histogram
+from app.utils.object_cache import object_cache
+
+logger = logging.getLogger(__name__)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"]
+)
+RATE_LIMITED = Counter("http_rate_limited", "Requests rejected by the rate limiter", ["route"])
+CACHE_HITS = Counter("cache_hits", "Cache lookups answered from the cache", ["cache"])
+CACHE_MISSES = Counter("cache_misses", "Cache lookups that fell through", ["cache"])
+POOL_CHECKOUTS = Counter("db_pool_checkouts", "Database connection checkouts", ["engine"])
+POOL_TIMEOUTS = Counter("db_pool_timeouts", "Checkouts that timed out waiting for a connection", ["engine"])
+POOL_WAIT = Counter("db_pool_wait_seconds", "Time spent waiting for a pooled connection", ["engine"])
+# Gauges of exited workers are dropped (see app.utils.metrics)
+POOL_SIZE = Gauge("db_pool_size", "Configured base pool size", ["engine"], multiprocess_mode="livesum")
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently in use", ["engine"], multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections opened beyond the base pool size", ["engine"], multiprocess_mode="livesum"
+)
+
+# Totals already reported per (counter, labels), so each sync only adds what is new
+_reported: Dict[Tuple[Counter, str], float] = {}
+
+
+def route_label(scope: Scope) -> str:
+    """Route template (``/users/{id}``) so labels stay bounded; unmatched paths share one label."""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "<unmatched>"
+
+
+def _advance(counter: Counter, label: str, total: float) -> None:
+    """Bring ``counter`` up to ``total``, a running count kept elsewhere (pool or cache stats)."""
+    delta = total - _reported.get((counter, label), 0.0)
+    if delta > 0:
+        counter.labels(label).inc(delta)
+        _reported[(counter, label)] = total
+
+
+def sync_runtime_metrics() -> None:
+    """Copy this worker's pool and cache counters (including the object disk cache) into its metrics file."""
+    for name, stats in engine_registry.stats().items():
+        if "checkouts" not in stats:
+            continue
+        _advance(POOL_CHECKOUTS, name, stats["checkouts"])
+        _advance(POOL_TIMEOUTS, name, stats["timeouts"])
+        _advance(POOL_WAIT, name, stats["wait_total_ms"] / 1000)
+        POOL_SIZE.labels(name).set(stats["size"])
+        POOL_CHECKED_OUT.labels(name).set(stats["checked_out"])
+        POOL_OVERFLOW.labels(name).set(max(0, stats["overflow"]))
+
+    cache_stats = cache.stats()
+    for tier in ("l1", "l2"):
+        _advance(CACHE_HITS, tier, cache_stats[f"{tier}_hits"])
+        _advance(CACHE_MISSES, tier, cache_stats[f"{tier}_misses"])
+    tokens = get_token_service()
+    if hasattr(tokens, "stats"):
+        token_stats = tokens.stats()
+        _advance(CACHE_HITS, "token", token_stats["hits"])
+        _advance(CACHE_MISSES, "token", token_stats["misses"])
+    object_stats = object_cache.stats()
+    _advance(CACHE_HITS, "object", object_stats["hits"])
+    _advance(CACHE_MISSES, "object", object_stats["misses"])
+
+
+async def collect_runtime_metrics(interval: float) -> None:
+    """Background task: refresh the pool/cache snapshot every ``interval`` seconds."""
+    while True:
+        try:
+            sync_runtime_metrics()
+        except Exception as e:
+            logger.warning(f"Collecting runtime metrics failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def require_metrics_access(request: Request) -> None:
+    """Allow scrapers holding METRICS_TOKEN as a bearer token; with no token configured, nobody."""
+    token = app_settings.METRICS_TOKEN
+    if token:
+        scheme, _, given = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(given.encode(), token.encode()):
+            return
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to read metrics")
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+async def metrics() -> Response:
+    sync_runtime_metrics()
+    # Reads every worker's metric files, so it runs off the loop
+    body = await run_in_threadpool(prometheus.render)
+    return Response(body, media_type=prometheus.CONTENT_TYPE_LATEST)
@@ -0,0 +1,260 @@
+import logging
+import random
+import time
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.platform.config import app_settings, db_settings
+from app.platform.db.engine import QueryStats, query_stats
+from app.platform.fastapi.metrics import REQUEST_LATENCY, route_label
+from app.utils.compression import compress, compress_stream, is_compressible, negotiate
+from app.utils.helpers import orjson_dumps
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Count the SQL a sampled request issues and report it.
+
+    A ``SQL_STATS_SAMPLE_RATE`` fraction of requests gets a QueryStats in the
+    ``query_stats`` context var, filled by the engine's cursor hooks. The totals go
+    out as a ``Server-Timing`` header; requests that are slow, issue too many
+    statements or repeat one statement (a likely N+1) also get a log line.
+    Unsampled requests only pay for one context var lookup per statement.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = db_settings.SQL_STATS_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and db_settings.SQL_STATS_SERVER_TIMING:
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        repeated = stats.repeated(db_settings.SQL_STATS_REPEAT_THRESHOLD)
+        if not (
+            repeated
+            or stats.count > db_settings.SQL_STATS_MAX_QUERIES
+            or stats.duration * 1000 > db_settings.SQL_STATS_SLOW_MS
+        ):
+            return
+        payload = {
+            "event": "sql_stats",
+            "method": scope["method"],
+            "path": scope["path"],
+            "queries": stats.count,
+            "db_ms": round(stats.duration * 1000, 1),
+            "repeated": [{"statement": statement[:200], "count": count} for statement, count in repeated],
+        }
+        logger.warning(orjson_dumps(payload))
+
+
+class MetricsMiddleware:
+    """Record request latency per method, route template and status into the shared metrics files."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_LATENCY.labels(scope["method"], route_label(scope), str(status_code)).observe(
+                time.perf_counter() - started
+            )
+
+
+class CompressionMiddleware:
+    """Compress compressible responses with the best encoding the client accepts (zstd, br, gzip).
+
+    Already-dense content (images, archives, office documents, PDFs, octet-stream),
+    responses that are already encoded, partial content and rangeable responses
+    (``Accept-Ranges: bytes``, e.g. file downloads, whose ETag and byte offsets must stay
+    those of the stored bytes) pass through untouched. Encoded responses get a suffixed
+    ETag; the suffix is stripped from incoming If-None-Match so the app still sees its
+    own tag and can answer 304.
+    The level drops as the body grows. Bodies of ``offload_size`` bytes or more are
+    compressed in the threadpool so the event loop keeps serving other requests.
+    Streaming responses are compressed chunk by chunk and flushed, so each chunk
+    still reaches the client right away.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = app_settings.COMPRESSION_MINIMUM_SIZE,
+        offload_size: int = app_settings.COMPRESSION_OFFLOAD_SIZE,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding"))
+        scope = _strip_encoding_suffixes(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        compressing_send = _CompressingSend(send, encoding, self.minimum_size, self.offload_size)
+        compressing_send.if_none_match = request_headers.get("if-none-match")
+        await self.app(scope, receive, compressing_send)
+
+
+# Suffixes _CompressingSend adds to strong ETags, for every encoding a client may have been sent
+_ETAG_SUFFIXES = tuple(f'-{encoding}"'.encode() for encoding in ("zstd", "br", "gzip"))
+
+
+def _strip_encoding_suffixes(scope: Scope) -> Scope:
+    """Map If-None-Match tags of encoded variants (``"x-gzip"``) back to the identity tag (``"x"``).
+
+    If-None-Match uses weak comparison, so any variant of the same content counts.
+    If-Range is left alone: its strong comparison must fail for an encoded variant.
+    """
+    headers = []
+    changed = False
+    for name, value in scope["headers"]:
+        if name == b"if-none-match":
+            tags = []
+            for tag in value.split(b","):
+                tag = tag.strip()
+                for suffix in _ETAG_SUFFIXES:
+                    if tag.endswith(suffix):
+                        tag = tag[: -len(suffix)] + b'"'
+                        changed = True
+                        break
+                tags.append(tag)
+            value = b", ".join(tags)
+        headers.append((name, value))
+    return {**scope, "headers": headers} if changed else scope
+
+
+class _CompressingSend:
+    def __init__(self, send: Send, encoding: str, minimum_size: int, offload_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.start: Optional[Message] = None
+        self.stream = None
+        self.passthrough = False
+        self.if_none_match: Optional[str] = None
+
+    def _eligible(self, status_code: int, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        return (
+            200 <= status_code < 300
+            and status_code not in (204, 206)
+            and "content-encoding" not in headers
+            and "content-range" not in headers
+            and headers.get("accept-ranges", "none").lower() == "none"
+            and is_compressible(headers.get("content-type"))
+            and (more_body or len(body) >= self.minimum_size)
+        )
+
+    def _encode_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # Byte ranges would address the identity bytes, not this encoding
+        del headers["Accept-Ranges"]
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # A strong ETag identifies one representation; the encoded one is different
+            headers["ETag"] = f'{etag[:-1]}-{self.encoding}"'
+
+    def _restore_variant_etag(self, headers: MutableHeaders) -> None:
+        # A 304 carries the ETag the client holds, which is the encoded variant's if that is what it sent
+        etag = headers.get("etag")
+        if not etag or etag.startswith("W/") or not self.if_none_match:
+            return
+        variant = f'{etag[:-1]}-{self.encoding}"'
+        if variant in (tag.strip() for tag in self.if_none_match.split(",")):
+            headers["ETag"] = variant
+
+    async def _run(self, fn, *args) -> bytes:
+        if sum(len(arg) for arg in args if isinstance(arg, bytes)) >= self.offload_size:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            if message["status"] == 304:
+                self._restore_variant_etag(MutableHeaders(scope=message))
+                await self.send(message)
+                self.passthrough = True
+                return
+            self.start = message
+            return
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if message["type"] != "http.response.body":
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if not self._eligible(start["status"], headers, body, more_body):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self._encode_headers(headers)
+            if not more_body:
+                body = await self._run(compress, body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            del headers["Content-Length"]
+            self.stream = compress_stream(self.encoding)
+            await self.send(start)
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        more_body = message.get("more_body", False)
+        chunk = await self._run(self.stream.compress, message.get("body", b""))
+        if not more_body:
+            chunk += self.stream.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
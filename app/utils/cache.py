@@ -1,24 +1,177 @@
+import asyncio
+import logging
 import os
+import uuid
+from typing import Any, Dict, Optional
 
+import orjson
 from aiocache import SimpleMemoryCache
 
+from app.utils.cache_backends import backend_from_url
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
 CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 300))  # default 5 menit
+NEGATIVE_CACHE_TTL = int(os.getenv("USER_NEGATIVE_CACHE_TTL", 30))
+EARLY_REFRESH = float(os.getenv("USER_CACHE_EARLY_REFRESH", 0))  # seconds before expiry, 0 = off
+L1_CACHE_TTL = int(os.getenv("CACHE_L1_TTL", 60))  # upper bound if an invalidation is missed
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")  # redis://... or memory:// ; unset = L1 only
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Stored for lookups that found nothing, so repeated misses skip the database
+NEGATIVE = b""
+
+
+def _encode(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return b"b" + value
+    if isinstance(value, str):
+        return b"s" + value.encode()
+    return b"j" + orjson.dumps(value)
+
+
+def _decode(data: bytes) -> Any:
+    kind, payload = data[:1], data[1:]
+    if kind == b"b":
+        return payload
+    if kind == b"s":
+        return payload.decode()
+    return orjson.loads(payload)
+
+
+class TwoTierCache:
+    """In-process L1 in front of an optional shared L2 (Redis protocol).
+
+    Every write or delete publishes the key on INVALIDATION_CHANNEL; the listener
+    started by ``start()`` drops that key from the L1 of every other worker.
+    """
+
+    def __init__(self, l1: SimpleMemoryCache, l2=None, l1_ttl: int = L1_CACHE_TTL):
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.node_id = uuid.uuid4().hex.encode()
+        self._listener: Optional[asyncio.Task] = None
+        self._stats = dict.fromkeys(
+            ("l1_hits", "l1_misses", "l2_hits", "l2_misses", "invalidations_sent", "invalidations_received"), 0
+        )
+
+    def _l1_ttl(self, ttl: Optional[int]) -> int:
+        return min(ttl, self.l1_ttl) if ttl else self.l1_ttl
+
+    async def get(self, key: str):
+        value = await self.l1.get(key)
+        if value is not None:
+            self._stats["l1_hits"] += 1
+            return value
+        self._stats["l1_misses"] += 1
+
+        if self.l2 is None:
+            return None
+        data, remaining = await self.l2.get_with_ttl(key)
+        if data is None:
+            self._stats["l2_misses"] += 1
+            return None
+        self._stats["l2_hits"] += 1
+        value = _decode(data)
+        # Never outlive the L2 entry: a short-lived value (negative lookup, pin) expires here too
+        ttl = self.l1_ttl if remaining is None else min(self.l1_ttl, remaining)
+        if ttl > 0:
+            await self.l1.set(key, value, ttl=ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        await self.l1.set(key, value, ttl=self._l1_ttl(ttl))
+        if self.l2 is not None:
+            await self.l2.set(key, _encode(value), ttl=ttl)
+            await self._publish(key)
+
+    async def delete(self, key: str):
+        await self.l1.delete(key)
+        if self.l2 is not None:
+            await self.l2.delete(key)
+            await self._publish(key)
 
-# Singleton memory cache instance
-cache = SimpleMemoryCache()
+    async def _publish(self, key: str):
+        self._stats["invalidations_sent"] += 1
+        await self.l2.publish(INVALIDATION_CHANNEL, self.node_id + b"|" + key.encode())
+
+    async def _listen(self):
+        while True:
+            try:
+                async for message in self.l2.subscribe(INVALIDATION_CHANNEL):
+                    node_id, _, key = message.partition(b"|")
+                    if node_id != self.node_id:
+                        self._stats["invalidations_received"] += 1
+                        await self.l1.delete(key.decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Entries may be stale until resubscribed; L1 TTL bounds the damage.
+                logger.error(f"Cache invalidation listener failed: {e}")
+                await self.l1.clear()
+                await asyncio.sleep(1)
+
+    async def start(self):
+        if self.l2 is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+            await asyncio.sleep(0)  # let the listener subscribe before traffic arrives
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self.l2 is not None:
+            await self.l2.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        for tier in ("l1", "l2"):
+            lookups = stats[f"{tier}_hits"] + stats[f"{tier}_misses"]
+            stats[f"{tier}_hit_ratio"] = stats[f"{tier}_hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# Singleton cache instance (L1 per worker, L2 shared when CACHE_REDIS_URL is set)
+cache = TwoTierCache(SimpleMemoryCache(), backend_from_url(CACHE_REDIS_URL))
+
+# Coalesces concurrent misses on the user cache so one coroutine per worker hits the DB
+user_flight = SingleFlight(early_refresh=EARLY_REFRESH)
 
 
 def user_cache_key(user_id: str) -> str:
-    return f"user:{user_id}"
+    # v2: entries no longer carry the password hash (see auth mappers.to_cache)
+    return f"user:v2:{user_id}"
 
 
 async def get_user_cache(user_id: str):
     return await cache.get(user_cache_key(user_id))
 
 
-async def set_user_cache(user_id: str, user_data: dict, ttl: int = CACHE_TTL):
+async def set_user_cache(user_id: str, user_data: Any, ttl: int = CACHE_TTL):
     await cache.set(user_cache_key(user_id), user_data, ttl=ttl)
 
 
 async def delete_user_cache(user_id: str):
     await cache.delete(user_cache_key(user_id))
+
+
+def user_email_cache_key(email: str) -> str:
+    return f"user:email:{email}"
+
+
+async def get_user_email_cache(email: str):
+    return await cache.get(user_email_cache_key(email))
+
+
+async def set_user_email_cache(email: str, user_id: Any, ttl: int = CACHE_TTL):
+    await cache.set(user_email_cache_key(email), user_id, ttl=ttl)
+
+
+async def delete_user_email_cache(email: str):
+    await cache.delete(user_email_cache_key(email))
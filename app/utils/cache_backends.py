@@ -0,0 +1,122 @@
+"""
+Shared (L2) cache backends for app.utils.cache
+
+Both backends speak the same small subset of the Redis protocol: get/set/delete with
+expiry (and a get that also reports the time left) plus publish/subscribe on a
+channel. RedisBackend talks to a real server; LocalBackend is an in-process stand-in
+(``memory://``) so several caches in one process can behave like several workers
+sharing one Redis.
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+
+
+class LocalBackend:
+    """In-process stand-in for Redis, shared by every cache built on the same instance."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[bytes], Optional[float]]:
+        """The value and its remaining seconds (None when it never expires)."""
+        value = await self.get(key)
+        if value is None:
+            return None, None
+        expires_at = self._data[key][0]
+        return value, None if expires_at is None else expires_at - time.monotonic()
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self._data[key] = (time.monotonic() + ttl if ttl else None, value)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(channel, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBackend:
+    """Redis-backed L2. Requires the optional ``redis`` package."""
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise RuntimeError("CACHE_REDIS_URL is set but the 'redis' extra is not installed") from exc
+
+        self._client = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[bytes], Optional[float]]:
+        async with self._client.pipeline(transaction=False) as pipe:
+            value, pttl = await pipe.get(key).pttl(key).execute()
+        if value is None:
+            return None, None
+        return value, None if pttl < 0 else pttl / 1000
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        await self._client.set(key, value, ex=ttl or None)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        await self._client.publish(channel, message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+_local_backend: Optional[LocalBackend] = None
+
+
+def backend_from_url(url: Optional[str]):
+    """Build the L2 backend for ``url``; ``None``/empty disables the shared tier."""
+    global _local_backend
+
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        if _local_backend is None:
+            _local_backend = LocalBackend()
+        return _local_backend
+    return RedisBackend(url)
@@ -0,0 +1,134 @@
+import zlib
+from typing import Dict, Optional, Tuple
+
+import brotli
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is only offered when the package is installed
+    zstandard = None
+
+# Only these are compressed; images, archives, office documents (zip containers),
+# PDFs and unknown binary (application/octet-stream) are already dense.
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+    "image/svg+xml",
+)
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+# Level per body size: (up to 64 KiB, up to 1 MiB, larger or streaming)
+_SIZE_STEPS = (64 * 1024, 1024 * 1024)
+_LEVELS = {"zstd": (6, 3, 1), "br": (5, 4, 1), "gzip": (6, 5, 1)}
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+def level_for(encoding: str, size: Optional[int]) -> int:
+    """Cheaper levels for bigger bodies; ``size=None`` (streaming) gets the cheapest."""
+    levels = _LEVELS[encoding]
+    if size is None:
+        return levels[-1]
+    for step, level in zip(_SIZE_STEPS, levels):
+        if size <= step:
+            return level
+    return levels[-1]
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync flush so every chunk reaches the client without waiting for the next one
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+_STREAMS = {"gzip": _GzipStream, "br": _BrotliStream}
+if zstandard is not None:
+    _STREAMS["zstd"] = _ZstdStream
+
+# Server preference when the client accepts several with the same q-value
+ENCODINGS = tuple(encoding for encoding in ("zstd", "br", "gzip") if encoding in _STREAMS)
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """One-shot compression; CPU bound, so callers offload large bodies to a thread."""
+    level = level_for(encoding, len(data)) if level is None else level
+    if encoding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def compress_stream(encoding: str, level: Optional[int] = None):
+    """Incremental compressor with ``compress(chunk)`` (flushed) and ``finish()``."""
+    return _STREAMS[encoding](level_for(encoding, None) if level is None else level)
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(accept_encoding: Optional[str], available: Tuple[str, ...] = ENCODINGS) -> Optional[str]:
+    """Best encoding the client accepts (highest q, then server preference), or None for identity."""
+    if not accept_encoding:
+        return None
+    accepted = _parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
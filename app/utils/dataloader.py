@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Mapping, Optional, Set, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Batch ``load(key)`` calls issued close together into one ``batch_fn(keys)`` call.
+
+    Keys requested in the same event-loop tick (or within ``window`` seconds of the
+    first one) are de-duplicated and handed to ``batch_fn`` in chunks of at most
+    ``max_batch_size``. ``batch_fn`` returns a mapping of key -> value; keys missing
+    from it resolve to ``None``. If ``batch_fn`` fails, every caller of that batch
+    receives the exception.
+
+    One loader is meant to be shared per worker, so ``batch_fn`` must not depend on
+    any single request's state (e.g. open its own DB session).
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Mapping[K, V]]],
+        max_batch_size: int = 100,
+        window: float = 0.0,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._pending: Dict[K, List[asyncio.Future]] = {}
+        self._scheduled: Optional[asyncio.Handle] = None
+        # The event loop only keeps weak references to tasks
+        self._running: Set[asyncio.Task] = set()
+        self._stats = {"loads": 0, "batches": 0, "keys": 0}
+
+    def load(self, key: K) -> Awaitable[Optional[V]]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        self._stats["loads"] += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._scheduled is None:
+            if self.window > 0:
+                self._scheduled = loop.call_later(self.window, self._dispatch)
+            else:
+                self._scheduled = loop.call_soon(self._dispatch)
+        return future
+
+    async def load_many(self, keys: List[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        # A full batch dispatches early; the timer would only find an empty or partial one
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = {key: pending[key] for key in keys[start : start + self.max_batch_size]}
+            task = asyncio.ensure_future(self._run(chunk))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: Dict[K, List[asyncio.Future]]) -> None:
+        self._stats["batches"] += 1
+        self._stats["keys"] += len(batch)
+        try:
+            results = await self.batch_fn(list(batch))
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        for key, futures in batch.items():
+            value = results.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self._stats["batches"]
+        return {**self._stats, "avg_batch_size": self._stats["keys"] / batches if batches else 0.0}
@@ -5,6 +5,7 @@ Provides robust async database operations with proper connection handling
 
 import asyncio
 import logging
+import sys
 from contextlib import asynccontextmanager
 from typing import Optional
 
@@ -12,7 +13,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.pool import NullPool
 
-from app.core.config import settings
+from app.platform.db.engine import engine_registry
 
 logger = logging.getLogger(__name__)
 
@@ -21,25 +22,26 @@ class DatabaseManager:
     """Manages database connections with proper async handling"""
 
     def __init__(self, database_url: Optional[str] = None):
-        self.database_url = database_url or settings.DATABASE_URL
+        """Without ``database_url`` the shared primary engine from the engine registry is used."""
+        self.database_url = database_url
         self._engine: Optional[AsyncEngine] = None
 
     @property
     def engine(self) -> AsyncEngine:
-        """Get or create the async engine with proper configuration"""
+        """Get the shared engine, or a dedicated NullPool engine for an explicit URL"""
+        if self.database_url is None:
+            return engine_registry.get()
         if self._engine is None:
             self._engine = create_async_engine(
                 self.database_url,
-                poolclass=NullPool,  # Use NullPool for migrations
+                poolclass=NullPool,
                 pool_pre_ping=True,
-                pool_recycle=3600,
                 echo=False,
-                future=True,
             )
         return self._engine
 
     async def dispose(self):
-        """Properly dispose the engine"""
+        """Dispose the engine this manager created; the shared registry engines belong to the app lifespan"""
         if self._engine is not None:
             await self._engine.dispose()
             self._engine = None
@@ -84,8 +86,9 @@ db_manager = DatabaseManager()
 
 
 async def cleanup_database_connections():
-    """Cleanup function for database connections"""
+    """Cleanup for standalone scripts, which own the process's shared engines too"""
     await db_manager.dispose()
+    await engine_registry.dispose()
 
 
 async def health_check():
@@ -1,49 +1,61 @@
+import asyncio
+import time
 from typing import Any, AsyncGenerator, BinaryIO, Dict, Optional
 
 import orjson
 
+from app.platform.config import app_settings, storage_settings
+from app.utils.serializers import to_dict
 
-def orm_to_dict(orm_instance: Any) -> Optional[Dict[str, Any]]:
-    """Convert SQLAlchemy ORM instance to dictionary."""
-    if orm_instance is None:
-        return None
 
-    result: Dict[str, Any] = {}
+def orm_to_dict(orm_instance: Any, depth: int = app_settings.SERIALIZER_MAX_DEPTH) -> Optional[Dict[str, Any]]:
+    """Convert SQLAlchemy ORM instance to dictionary (loaded attributes only, see app.utils.serializers)."""
+    return to_dict(orm_instance, depth)
 
-    # Handle basic attributes
-    for key in orm_instance.__mapper__.c.keys():
-        result[key] = getattr(orm_instance, key)
 
-    # Handle relationships if needed
-    for relationship in orm_instance.__mapper__.relationships:
-        rel_name = relationship.key
-        rel_value = getattr(orm_instance, rel_name)
-        if rel_value is not None:
-            # Check if it's a collection
-            if hasattr(rel_value, "__iter__") and not isinstance(rel_value, (str, bytes)):
-                result[rel_name] = [orm_to_dict(item) for item in rel_value]
-            else:
-                result[rel_name] = orm_to_dict(rel_value)
-
-    return result
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_UUID | orjson.OPT_UTC_Z
 
 
 def orjson_dumps(__obj: Any, *, default: Optional[Any] = None) -> str:
     """Custom JSON serializer using orjson."""
-    return orjson.dumps(
-        __obj,
-        default=default,
-        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_UUID | orjson.OPT_UTC_Z,
-    ).decode("utf-8")
+    return orjson.dumps(__obj, default=default, option=ORJSON_OPTIONS).decode("utf-8")
+
+
+# Time the consumer took to accept a chunk: below FAST the chunk size doubles, above SLOW it halves
+_FAST_SEND = 0.005
+_SLOW_SEND = 0.05
+
+
+async def read_chunk(stream: asyncio.StreamReader, size: int) -> bytes:
+    """Read ``size`` bytes, or whatever is left at the end of the stream."""
+    try:
+        return await stream.readexactly(size)
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+
 
+async def iterfile(
+    file_content: BinaryIO,
+    size: Optional[int] = None,
+    min_chunk: int = storage_settings.DOWNLOAD_MIN_CHUNK,
+    max_chunk: int = storage_settings.DOWNLOAD_MAX_CHUNK,
+) -> AsyncGenerator[bytes, None]:
+    """Iterate over file content in chunks sized to the body and the client's pace.
 
-async def iterfile(file_content: BinaryIO) -> AsyncGenerator[bytes, None]:
-    """Iterate over file content in chunks."""
+    The first chunk is 1/16 of ``size`` (clamped to ``min_chunk``..``max_chunk``).
+    The generator resumes only once the previous chunk was sent, so a quick resume
+    means the client keeps up and the chunk size doubles; a slow one halves it.
+    """
+    chunk_size = min(max(size // 16, min_chunk), max_chunk) if size else min_chunk
     try:
-        chunk = await file_content.content.read(8192)
-        while chunk:
+        while chunk := await read_chunk(file_content.content, chunk_size):
+            started = time.perf_counter()
             yield chunk
-            chunk = await file_content.content.read(8192)
+            elapsed = time.perf_counter() - started
+            if elapsed < _FAST_SEND:
+                chunk_size = min(chunk_size * 2, max_chunk)
+            elif elapsed > _SLOW_SEND:
+                chunk_size = max(chunk_size // 2, min_chunk)
     finally:
         await file_content.release()
 
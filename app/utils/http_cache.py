@@ -0,0 +1,112 @@
+import hashlib
+import struct
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from starlette.concurrency import run_in_threadpool
+
+from app.platform.config import app_settings, storage_settings
+from app.utils.cache import cache
+from app.utils.compression import ENCODINGS, compress, is_compressible
+
+_PREFIX = "response"
+
+# Response headers that describe one transfer rather than the cached representation
+_SKIP_HEADERS = {"content-length", "content-encoding", "etag", "cache-control", "vary", "set-cookie", "date", "server"}
+
+
+class CachedResponse:
+    """A serialized 200 response plus its pre-compressed variants, keyed by content-encoding."""
+
+    __slots__ = ("etag", "headers", "bodies")
+
+    def __init__(self, etag: str, headers: List[Tuple[str, str]], bodies: Dict[str, bytes]):
+        self.etag = etag
+        self.headers = headers
+        self.bodies = bodies
+
+    def etag_for(self, encoding: str) -> str:
+        return self.etag if encoding == "identity" else f'{self.etag[:-1]}-{encoding}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Weak comparison, as If-None-Match requires; any variant's ETag counts."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or any(self.etag_for(encoding) in tags for encoding in self.bodies)
+
+    def pack(self) -> bytes:
+        encodings = list(self.bodies)
+        meta = orjson.dumps([self.etag, self.headers, [[e, len(self.bodies[e])] for e in encodings]])
+        return struct.pack("I", len(meta)) + meta + b"".join(self.bodies[e] for e in encodings)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CachedResponse":
+        (length,) = struct.unpack_from("I", data, 0)
+        etag, headers, sizes = orjson.loads(data[4 : 4 + length])
+        bodies, position = {}, 4 + length
+        for encoding, size in sizes:
+            bodies[encoding] = data[position : position + size]
+            position += size
+        return cls(etag, [tuple(header) for header in headers], bodies)
+
+
+def _compress_all(body: bytes) -> Dict[str, bytes]:
+    # Done once per cache fill, so use the strongest level meant for this body size
+    return {encoding: compress(body, encoding) for encoding in ENCODINGS}
+
+
+async def build(body: bytes, headers: Iterable[Tuple[str, str]]) -> CachedResponse:
+    headers = [(name, value) for name, value in headers if name.lower() not in _SKIP_HEADERS]
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    bodies = {"identity": body}
+    content_type = next((value for name, value in headers if name.lower() == "content-type"), None)
+    if is_compressible(content_type) and len(body) >= app_settings.COMPRESSION_MINIMUM_SIZE:
+        if len(body) >= app_settings.COMPRESSION_OFFLOAD_SIZE:
+            bodies.update(await run_in_threadpool(_compress_all, body))
+        else:
+            bodies.update(_compress_all(body))
+    return CachedResponse(etag, headers, bodies)
+
+
+def enabled() -> bool:
+    """True when a shared L2 is configured, or RESPONSE_CACHE_LOCAL is set.
+
+    Without L2, ``invalidate_tags`` reaches only this worker, and the others would keep
+    serving stale responses for the full TTL.
+    """
+    return cache.l2 is not None or storage_settings.RESPONSE_CACHE_LOCAL
+
+
+def _tag_key(tag: str) -> str:
+    return f"{_PREFIX}:tag:{tag}"
+
+
+async def cache_key(parts: Sequence[str], tags: Sequence[str]) -> str:
+    """Key over the request parts and the current version of every tag, so bumping a tag orphans its entries."""
+    versions = []
+    for tag in tags:
+        version = await cache.get(_tag_key(tag))
+        if version is None:
+            # Never fall back to a fixed version: entries of an evicted version must stay orphaned
+            version = time.time_ns()
+            await cache.set(_tag_key(tag), version)
+        versions.append(version)
+    digest = hashlib.blake2b(orjson.dumps([list(parts), versions]), digest_size=20).hexdigest()
+    return f"{_PREFIX}:{digest}"
+
+
+async def get(key: str) -> Optional[CachedResponse]:
+    data = await cache.get(key)
+    return CachedResponse.unpack(data) if data else None
+
+
+async def put(key: str, entry: CachedResponse, ttl: int) -> None:
+    await cache.set(key, entry.pack(), ttl=ttl)
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """Called by writes: every cached response carrying one of ``tags`` stops matching."""
+    for tag in tags:
+        await cache.set(_tag_key(tag), time.time_ns())
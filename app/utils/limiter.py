@@ -1,4 +1,31 @@
+import logging
+import time
+from typing import Dict
+
+from fastapi import Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+logger = logging.getLogger(__name__)
+
 limiter = Limiter(key_func=get_remote_address)
+
+
+def rate_limit_headers(request: Request) -> Dict[str, str]:
+    """X-RateLimit-* and Retry-After headers for the limit the request was checked against."""
+    current = getattr(request.state, "view_rate_limit", None)
+    if current is None:
+        return {}
+    item, args = current
+    try:
+        reset_at, remaining = limiter.limiter.get_window_stats(item, *args)
+    except Exception as e:
+        logger.warning(f"Reading rate limit window failed: {e!r}")
+        return {}
+    reset = int(reset_at) + 1
+    return {
+        "X-RateLimit-Limit": str(item.amount),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+        "Retry-After": str(max(0, reset - int(time.time()))),
+    }
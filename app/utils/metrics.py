@@ -0,0 +1,74 @@
+"""
+Prometheus metrics shared by all workers
+
+Uses prometheus_client in multiprocess mode: every worker writes its samples to its
+own files in ``PROMETHEUS_MULTIPROC_DIR`` (METRICS_DIR unless set), and whichever
+worker answers ``/metrics`` merges them. Define metrics with the classes re-exported
+here, never by importing prometheus_client first, so the directory is configured
+before the first metric exists.
+
+Trade-off: every ``inc()``/``observe()`` takes prometheus_client's process-wide
+``threading.Lock`` around the mmap write. Nothing waits on another worker, and on the
+event loop thread the lock is uncontended (only threadpool code can compete for it),
+so the request path pays an uncontended acquire per update instead of being lock-free.
+"""
+
+import glob
+import os
+import shutil
+
+from app.platform.config import app_settings
+
+# prometheus_client chooses between in-process and file-backed values at import time
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", app_settings.METRICS_DIR)
+METRICS_DIR = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+os.makedirs(METRICS_DIR, exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+__all__ = ["CONTENT_TYPE_LATEST", "Counter", "Gauge", "Histogram", "clear", "render"]
+
+
+def clear() -> None:
+    """Remove the files of a previous run; must run once before the workers start (see run.py)."""
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _reap_dead_workers() -> None:
+    # Live gauges of a worker that exited (or was recycled) must stop counting;
+    # its counters and histograms keep contributing to the totals.
+    pids = set()
+    for path in glob.glob(os.path.join(METRICS_DIR, "*.db")):
+        pid = os.path.basename(path)[:-3].rpartition("_")[2]
+        if pid.isdigit():
+            pids.add(int(pid))
+    for pid in pids:
+        if not _alive(pid):
+            multiprocess.mark_process_dead(pid, METRICS_DIR)
+
+
+def render() -> bytes:
+    """All workers' samples in the Prometheus text exposition format; reads files, so run it off the loop."""
+    _reap_dead_workers()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, METRICS_DIR)
+    return generate_latest(registry)
@@ -1,27 +1,121 @@
-from typing import Any, BinaryIO, Dict, List, Optional, Tuple
-from urllib.parse import urlparse
+import asyncio
+import logging
+import os
+import re
+import ssl
+import time
+from collections import OrderedDict, deque
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlparse
 
-from fastapi import HTTPException, status
+import certifi
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, TCPConnector, TraceConfig
+from aiohttp_retry import ExponentialRetry, RetryClient
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from miniopy_async import Minio
-from miniopy_async.error import S3Error
+from miniopy_async.datatypes import Part, PostPolicy
+from miniopy_async.error import S3Error, ServerError
+from miniopy_async.helpers import genheaders
 
-from app.core.config import settings
+from app.platform.config import storage_settings as settings
+from app.utils.helpers import iterfile, read_chunk
+from app.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# One byte range ("bytes=0-99", "bytes=100-", "bytes=-100"); anything else is served in full
+_SINGLE_RANGE = re.compile(r"^bytes=(\d+-\d*|-\d+)$")
+
+REQUEST_LATENCY = Histogram(
+    "minio_request_duration_seconds", "Object storage requests by method and status", ["method", "status"]
+)
 
 
 class MinioClient:
     """
     Client class untuk interaksi dengan MinIO Object Storage secara asinkron.
+
+    Satu instance per worker (``minio_client``) dipakai bersama semua request.
+    ``start()`` (dipanggil di lifespan) memasang HTTP pool dengan keep-alive dan
+    memastikan bucket ada; status bucket lalu di-cache sehingga upload tidak
+    perlu round trip ``bucket_exists`` lagi. ``close()`` menutup pool.
     """
 
     def __init__(self):
+        parsed_endpoint = urlparse(settings.MINIO_ENDPOINT_URL)
         self.client = Minio(
-            endpoint=settings.MINIO_ENDPOINT_URL,
+            endpoint=parsed_endpoint.netloc or settings.MINIO_ENDPOINT_URL,
             access_key=settings.MINIO_ROOT_USER,
             secret_key=settings.MINIO_ROOT_PASSWORD,
             secure=settings.MINIO_SECURE,
             region=settings.MINIO_REGION,
+            server_url=settings.MINIO_PUBLIC_URL,
         )
         self.bucket_name = settings.MINIO_BUCKET_NAME
+        self.bucket_ready = False
+        # Called with the object name after this worker overwrites or deletes it (e.g. to drop cached copies)
+        self.change_listeners: List[Callable[[str], None]] = []
+        # (object name, expiry) -> (reuse until, presigned GET URL), least recently used first
+        self._signed: "OrderedDict[Tuple[str, int], Tuple[float, str]]" = OrderedDict()
+        self._stats = {"requests": 0, "errors": 0, "latency_total": 0.0}
+
+    def _trace_config(self) -> TraceConfig:
+        trace = TraceConfig()
+
+        async def on_start(session, context, params):
+            context.started = time.perf_counter()
+
+        async def on_end(session, context, params):
+            self._record(params.method, str(params.response.status), time.perf_counter() - context.started)
+
+        async def on_error(session, context, params):
+            self._stats["errors"] += 1
+            self._record(params.method, "error", time.perf_counter() - context.started)
+
+        trace.on_request_start.append(on_start)
+        trace.on_request_end.append(on_end)
+        trace.on_request_exception.append(on_error)
+        return trace
+
+    def _record(self, method: str, status_code: str, elapsed: float) -> None:
+        self._stats["requests"] += 1
+        self._stats["latency_total"] += elapsed
+        REQUEST_LATENCY.labels(method, status_code).observe(elapsed)
+
+    def _session(self) -> RetryClient:
+        ssl_context = ssl.create_default_context(cafile=os.environ.get("SSL_CERT_FILE") or certifi.where())
+        session = ClientSession(
+            connector=TCPConnector(
+                limit=settings.MINIO_POOL_SIZE,
+                keepalive_timeout=settings.MINIO_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300,
+                ssl=ssl_context,
+            ),
+            timeout=ClientTimeout(connect=settings.MINIO_CONNECT_TIMEOUT, sock_read=settings.MINIO_READ_TIMEOUT),
+            trace_configs=[self._trace_config()],
+        )
+        # Same retry policy miniopy_async uses for its own default session
+        retry_options = ExponentialRetry(attempts=5, factor=0.2, statuses={500, 502, 503, 504})
+        return RetryClient(session, retry_options=retry_options)
+
+    async def start(self) -> None:
+        """
+        Pasang HTTP pool dan pastikan bucket tersedia (sekali per worker).
+        """
+        self.client.set_session(self._session())
+        try:
+            await self.init_bucket()
+        except Exception as e:
+            # Keep serving; ensure_bucket() retries on the first upload
+            logger.warning(f"MinIO bucket check failed at startup: {e}")
+
+    async def close(self) -> None:
+        await self.client.close_session()
 
     async def init_bucket(self) -> None:
         """
@@ -33,12 +127,38 @@ class MinioClient:
                 # Set bucket policy agar dapat diakses publik jika diperlukan
                 # policy = {...}  # Define your policy if needed
                 # await self.client.set_bucket_policy(self.bucket_name, json.dumps(policy))
+            self.bucket_ready = True
         except S3Error as err:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error initializing MinIO bucket: {str(err)}",
             )
 
+    async def ensure_bucket(self) -> None:
+        """
+        Cek bucket hanya jika statusnya belum diketahui (mis. ``start()`` belum dipanggil).
+        """
+        if not self.bucket_ready:
+            await self.init_bucket()
+
+    def _forget_bucket(self, err: S3Error) -> None:
+        # The bucket was removed behind our back; check it again on the next upload
+        if err.code == "NoSuchBucket":
+            self.bucket_ready = False
+
+    def _changed(self, object_name: str) -> None:
+        for listener in self.change_listeners:
+            listener(object_name)
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self._stats["requests"]
+        return {
+            "requests": requests,
+            "errors": self._stats["errors"],
+            "latency_avg_ms": self._stats["latency_total"] / requests * 1000 if requests else 0.0,
+            "bucket_ready": self.bucket_ready,
+        }
+
     async def upload_file(
         self,
         file_data: BinaryIO,
@@ -60,7 +180,7 @@ class MinioClient:
             URL objek yang telah diupload
         """
         try:
-            await self.init_bucket()
+            await self.ensure_bucket()
 
             # Upload file
             await self.client.put_object(
@@ -71,42 +191,331 @@ class MinioClient:
                 content_type=content_type,
                 metadata=metadata,
             )
+            self._changed(object_name)
 
             # Generate URL
             url = await self.get_file_url(object_name)
             return url
 
         except S3Error as err:
+            self._forget_bucket(err)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error uploading file to MinIO: {str(err)}",
             )
 
-    async def get_file(self, object_name: str) -> Tuple[BinaryIO, Dict[str, Any]]:
+    @staticmethod
+    def check_extension(object_name: str) -> None:
+        extension = os.path.splitext(object_name)[1].lstrip(".").lower()
+        if extension not in settings.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File extension '{extension}' is not allowed",
+            )
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        object_name: str,
+        content_type: str,
+        metadata: Optional[Dict[str, str]] = None,
+        part_size: int = settings.UPLOAD_PART_SIZE,
+        concurrency: int = settings.UPLOAD_CONCURRENCY,
+    ) -> str:
         """
-        Ambil file dari MinIO.
+        Upload file ke MinIO secara streaming (multipart) tanpa menampung seluruh file.
 
-        Args:
-            object_name: Nama objek di MinIO
+        Parts of ``part_size`` bytes are uploaded while the next one is being read, with
+        at most ``concurrency`` in flight; reading waits for a free slot, so memory stays
+        at roughly ``(concurrency + 1) * part_size``. Files smaller than one part use a
+        single PUT. MAX_UPLOAD_SIZE is enforced as bytes arrive. If the client
+        disconnects or anything fails, in-flight parts are cancelled and the multipart
+        upload is aborted so no orphaned parts remain.
 
         Returns:
-            Tuple dari (file data, object info)
+            URL objek yang telah diupload
+        """
+        self.check_extension(object_name)
+        await self.ensure_bucket()
+
+        # The multipart calls below are miniopy_async's private API; their signatures were
+        # checked on 1.23, the minor pyproject.toml pins
+        headers = genheaders(metadata, None, None, None, False)
+        headers["Content-Type"] = content_type or "application/octet-stream"
+        slots = asyncio.Semaphore(concurrency)
+        tasks: List[asyncio.Task] = []
+        upload_id: Optional[str] = None
+        buffer = bytearray()
+        total = 0
+
+        async def upload_part(data: bytes, part_number: int) -> Part:
+            try:
+                etag = await self.client._upload_part(
+                    self.bucket_name, object_name, data, None, upload_id, part_number
+                )
+                return Part(part_number, etag)
+            finally:
+                slots.release()
+
+        async def submit(data: bytes) -> None:
+            nonlocal upload_id
+            if upload_id is None:
+                upload_id = await self.client._create_multipart_upload(self.bucket_name, object_name, headers)
+            await slots.acquire()
+            tasks.append(asyncio.create_task(upload_part(data, len(tasks) + 1)))
+            # Surface a failed part now instead of after the whole body was read
+            for task in tasks:
+                if task.done() and task.exception() is not None:
+                    raise task.exception()
+
+        try:
+            try:
+                async for chunk in chunks:
+                    total += len(chunk)
+                    if total > settings.MAX_UPLOAD_SIZE:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File exceeds the {settings.MAX_UPLOAD_SIZE} byte upload limit",
+                        )
+                    buffer += chunk
+                    while len(buffer) >= part_size:
+                        await submit(bytes(buffer[:part_size]))
+                        del buffer[:part_size]
+
+                if upload_id is None:
+                    await self.client._put_object(self.bucket_name, object_name, bytes(buffer), headers)
+                else:
+                    if buffer:
+                        await submit(bytes(buffer))
+                    parts = await asyncio.gather(*tasks)
+                    await self.client._complete_multipart_upload(
+                        self.bucket_name, object_name, upload_id, list(parts)
+                    )
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                if upload_id is not None:
+                    with suppress(Exception):
+                        await asyncio.shield(
+                            self.client._abort_multipart_upload(self.bucket_name, object_name, upload_id)
+                        )
+                raise
+        except S3Error as err:
+            self._forget_bucket(err)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error uploading file to MinIO: {str(err)}",
+            )
+
+        self._changed(object_name)
+        return await self.get_file_url(object_name)
+
+    async def upload_request(
+        self, request: Request, object_name: str, metadata: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Upload body request (raw file bytes) ke MinIO sambil dibaca.
+
+        A declared Content-Length above MAX_UPLOAD_SIZE is rejected before reading.
+        A client disconnect raises ``ClientDisconnect`` and aborts the upload.
+        """
+        declared = request.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > settings.MAX_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds the {settings.MAX_UPLOAD_SIZE} byte upload limit",
+            )
+        return await self.upload_stream(
+            request.stream(),
+            object_name,
+            request.headers.get("content-type", "application/octet-stream"),
+            metadata,
+        )
+
+    async def stat_file(self, object_name: str) -> Dict[str, Any]:
+        """
+        Ambil info objek (HEAD, tanpa body).
+
+        Returns:
+            Dict dengan size, content_type, etag, last_modified dan metadata
         """
         try:
             stat = await self.client.stat_object(bucket_name=self.bucket_name, object_name=object_name)
+        except S3Error as err:
+            if err.code == "NoSuchKey":
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error retrieving file from MinIO: {str(err)}",
+            )
+        return {
+            "size": stat.size,
+            "content_type": stat.content_type or "application/octet-stream",
+            "etag": f'"{stat.etag}"',
+            "last_modified": formatdate(stat.last_modified.timestamp(), usegmt=True) if stat.last_modified else None,
+            "metadata": _user_metadata(stat.metadata or {}),
+        }
+
+    async def get_file(
+        self, object_name: str, request_headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[ClientResponse, Dict[str, Any]]:
+        """
+        Ambil file dari MinIO dengan satu request ``get_object``.
 
-            response = await self.client.get_object(bucket_name=self.bucket_name, object_name=object_name)
+        Info objek dibaca dari header response (tanpa ``stat_object`` terpisah).
+        ``request_headers`` diteruskan apa adanya (mis. Range, If-Match).
 
-            return response, stat.__dict__
+        Args:
+            object_name: Nama objek di MinIO
+            request_headers: Header tambahan untuk request ke MinIO
+
+        Returns:
+            Tuple dari (file data, object info)
+        """
+        try:
+            response = await self.client.get_object(
+                bucket_name=self.bucket_name, object_name=object_name, request_headers=request_headers
+            )
+            return response, _object_info(response)
 
         except S3Error as err:
             if err.code == "NoSuchKey":
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+            if err.code == "InvalidRange":
+                raise HTTPException(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, detail="Range not satisfiable"
+                )
+            if err.code == "PreconditionFailed":
+                raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Precondition failed")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error retrieving file from MinIO: {str(err)}",
             )
 
+    async def download(self, request: Request, object_name: str, filename: Optional[str] = None) -> Response:
+        """
+        Response download yang mendukung Range, If-Range dan If-None-Match (206/304).
+
+        A single byte range is forwarded to MinIO (multiple ranges get the full body,
+        which RFC 9110 allows). If-Range is mapped to If-Match / If-Unmodified-Since
+        on the same ranged request; when it fails the object changed and the full body
+        is fetched instead. If-None-Match is evaluated by MinIO and answered with 304.
+        Bodies of DOWNLOAD_PARALLEL_THRESHOLD or more are read as concurrent ranged parts.
+        """
+        request_headers: Dict[str, str] = {}
+        range_header = request.headers.get("range")
+        if range_header and _SINGLE_RANGE.match(range_header.strip()):
+            if_range = request.headers.get("if-range")
+            if if_range is None:
+                request_headers["Range"] = range_header
+            elif if_range.startswith('"'):
+                request_headers.update({"Range": range_header, "If-Match": if_range})
+            elif not if_range.startswith("W/"):
+                # A weak validator never satisfies If-Range; a date must not have changed since
+                request_headers.update({"Range": range_header, "If-Unmodified-Since": if_range})
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            request_headers["If-None-Match"] = if_none_match
+
+        try:
+            try:
+                response, info = await self.get_file(object_name, request_headers)
+            except HTTPException as exc:
+                if exc.status_code != status.HTTP_412_PRECONDITION_FAILED or "Range" not in request_headers:
+                    raise
+                for name in ("Range", "If-Match", "If-Unmodified-Since"):
+                    request_headers.pop(name, None)
+                response, info = await self.get_file(object_name, request_headers)
+        except ServerError as err:
+            if err.status_code != status.HTTP_304_NOT_MODIFIED:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Error retrieving file from MinIO: {str(err)}",
+                )
+            headers = {"Cache-Control": settings.CACHE_CONTROL}
+            if not if_none_match.startswith("*") and "," not in if_none_match:
+                headers["ETag"] = if_none_match
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Cache-Control": settings.CACHE_CONTROL,
+            "Content-Length": str(info["size"]),
+        }
+        if info["content_range"]:
+            headers["Content-Range"] = info["content_range"]
+        if info["etag"]:
+            headers["ETag"] = info["etag"]
+        if info["last_modified"]:
+            headers["Last-Modified"] = info["last_modified"]
+        if filename:
+            headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(filename)}"
+
+        if info["size"] >= settings.DOWNLOAD_PARALLEL_THRESHOLD:
+            body = self._iter_parts(response, object_name, info["offset"], info["size"], info["etag"])
+        else:
+            body = iterfile(response, info["size"])
+        return StreamingResponse(
+            body,
+            status_code=status.HTTP_206_PARTIAL_CONTENT if info["content_range"] else status.HTTP_200_OK,
+            headers=headers,
+            media_type=info["content_type"],
+        )
+
+    async def _iter_parts(
+        self, first: ClientResponse, object_name: str, offset: int, length: int, etag: Optional[str]
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream ``length`` bytes from ``offset`` as DOWNLOAD_PART_SIZE parts fetched concurrently.
+
+        The already-open ``first`` response supplies the first part and is then closed;
+        the remaining parts are ranged GETs pinned to ``etag`` with If-Match, at most
+        DOWNLOAD_CONCURRENCY ahead of the client, and are yielded in order.
+        """
+        part_size = settings.DOWNLOAD_PART_SIZE
+        max_chunk = settings.DOWNLOAD_MAX_CHUNK
+        end = offset + length
+        pinned = {"If-Match": etag} if etag else None
+
+        async def fetch(part_offset: int) -> bytes:
+            response = await self.client.get_object(
+                self.bucket_name,
+                object_name,
+                offset=part_offset,
+                length=min(part_size, end - part_offset),
+                request_headers=pinned,
+            )
+            try:
+                return await response.read()
+            finally:
+                await response.release()
+
+        offsets = iter(range(offset + part_size, end, part_size))
+        pending = deque(asyncio.create_task(fetch(part)) for part in islice(offsets, settings.DOWNLOAD_CONCURRENCY))
+        try:
+            remaining = min(part_size, length)
+            while remaining:
+                chunk = await read_chunk(first.content, min(max_chunk, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+            first.close()
+
+            while pending:
+                data = await pending.popleft()
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    pending.append(asyncio.create_task(fetch(next_offset)))
+                for position in range(0, len(data), max_chunk):
+                    yield data[position : position + max_chunk]
+        finally:
+            first.close()
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def delete_file(self, object_name: str) -> bool:
         """
         Hapus file dari MinIO.
@@ -119,6 +528,7 @@ class MinioClient:
         """
         try:
             await self.client.remove_object(self.bucket_name, object_name)
+            self._changed(object_name)
             return True
         except S3Error as err:
             if err.code == "NoSuchKey":
@@ -132,37 +542,125 @@ class MinioClient:
         """
         Dapatkan URL untuk mengakses file.
 
+        Dengan MINIO_PRESIGNED aktif, URL berupa presigned GET (lihat ``presigned_url``),
+        sehingga file privat diunduh langsung dari MinIO tanpa melewati worker.
+
         Args:
             object_name: Nama objek di MinIO
 
         Returns:
             URL untuk mengakses file
         """
-        try:
-            # For public access
-            if settings.MINIO_SECURE:
-                protocol = "https"
-            else:
-                protocol = "http"
+        if settings.MINIO_PRESIGNED:
+            return await self.presigned_url(object_name)
+
+        # For public access
+        return f"{self._bucket_url()}/{object_name}"
 
-            parsed_endpoint = urlparse(settings.MINIO_ENDPOINT_URL)
-            host = parsed_endpoint.netloc or settings.MINIO_ENDPOINT_URL
+    def _bucket_url(self) -> str:
+        if settings.MINIO_PUBLIC_URL:
+            return f"{settings.MINIO_PUBLIC_URL.rstrip('/')}/{self.bucket_name}"
+        protocol = "https" if settings.MINIO_SECURE else "http"
+        parsed_endpoint = urlparse(settings.MINIO_ENDPOINT_URL)
+        host = parsed_endpoint.netloc or settings.MINIO_ENDPOINT_URL
+        return f"{protocol}://{host}/{self.bucket_name}"
 
-            return f"{protocol}://{host}/{self.bucket_name}/{object_name}"
+    async def presigned_url(self, object_name: str, expires: Optional[int] = None) -> str:
+        """
+        Buat presigned GET URL untuk download langsung dari MinIO.
+
+        Signing is local (after the bucket region is known), yet list views sign the same
+        names over and over, so URLs are reused for PRESIGNED_CACHE_TTL seconds (at most
+        half of ``expires``): a cached URL always has at least half its lifetime left.
+        The caller decides who may read ``object_name``.
+
+        Args:
+            object_name: Nama objek di MinIO
+            expires: Masa berlaku dalam detik (default PRESIGNED_GET_EXPIRES)
 
-            # For presigned URL (time-limited access):
-            # return await self.client.presigned_get_object(
-            #     bucket_name=self.bucket_name,
-            #     object_name=object_name,
-            #     expires=timedelta(hours=1)
-            # )
+        Returns:
+            Presigned URL
+        """
+        expires = expires or settings.PRESIGNED_GET_EXPIRES
+        key = (object_name, expires)
+        now = time.monotonic()
+        cached = self._signed.get(key)
+        if cached is not None and cached[0] > now:
+            self._signed.move_to_end(key)
+            return cached[1]
 
+        try:
+            url = await self.client.get_presigned_url(
+                "GET", self.bucket_name, object_name, expires=timedelta(seconds=expires)
+            )
+        except ValueError as err:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err))
         except S3Error as err:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error generating URL: {str(err)}",
             )
 
+        self._signed[key] = (now + min(settings.PRESIGNED_CACHE_TTL, expires / 2), url)
+        self._signed.move_to_end(key)
+        while len(self._signed) > settings.PRESIGNED_CACHE_SIZE:
+            self._signed.popitem(last=False)
+        return url
+
+    async def presigned_urls(self, object_names: List[str], expires: Optional[int] = None) -> Dict[str, str]:
+        """
+        Presigned GET URL untuk banyak objek sekaligus (mis. satu halaman list).
+        """
+        return {name: await self.presigned_url(name, expires) for name in object_names}
+
+    async def presigned_upload(self, object_name: str, expires: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Buat presigned POST policy untuk upload langsung ke MinIO.
+
+        Unlike a bare presigned PUT, the policy pins the key and a content-length-range
+        of at most MAX_UPLOAD_SIZE bytes, and MinIO rejects uploads outside it. The client
+        posts ``fields`` plus a ``file`` part to ``url`` as multipart/form-data, then calls
+        ``complete_upload`` so the object is checked and cached copies are dropped.
+
+        Returns:
+            Dict dengan ``url`` dan ``fields`` untuk form upload
+        """
+        self.check_extension(object_name)
+        expires = expires or settings.PRESIGNED_UPLOAD_EXPIRES
+        policy = PostPolicy(self.bucket_name, datetime.now(timezone.utc) + timedelta(seconds=expires))
+        policy.add_equals_condition("key", object_name)
+        policy.add_content_length_range_condition(0, settings.MAX_UPLOAD_SIZE)
+        try:
+            fields = await self.client.presigned_post_policy(policy)
+        except ValueError as err:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err))
+        except S3Error as err:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error generating upload policy: {str(err)}",
+            )
+        return {"url": self._bucket_url(), "fields": {**fields, "key": object_name}}
+
+    async def complete_upload(self, object_name: str) -> Dict[str, Any]:
+        """
+        Selesaikan upload presigned: validasi objek dan beri tahu listener perubahan.
+
+        MinIO already enforced the policy; the size is checked again in case the policy was
+        signed under a larger MAX_UPLOAD_SIZE, and an oversized object is deleted.
+
+        Returns:
+            Info objek (lihat ``stat_file``)
+        """
+        info = await self.stat_file(object_name)
+        if info["size"] > settings.MAX_UPLOAD_SIZE:
+            await self.delete_file(object_name)
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds the {settings.MAX_UPLOAD_SIZE} byte upload limit",
+            )
+        self._changed(object_name)
+        return info
+
     async def list_files(self, prefix: str = "", recursive: bool = True) -> List[Dict[str, Any]]:
         """
         Daftar semua file di dalam bucket dengan prefix tertentu.
@@ -191,3 +689,34 @@ class MinioClient:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error listing files: {str(err)}",
             )
+
+
+def _object_info(response: ClientResponse) -> Dict[str, Any]:
+    """Object info from a ``get_object`` response; ``size``/``offset`` describe the returned span."""
+    headers = response.headers
+    content_range = headers.get("Content-Range")
+    offset = 0
+    if content_range:
+        offset = int(content_range.removeprefix("bytes ").split("-", 1)[0])
+    return {
+        "size": int(headers.get("Content-Length", 0)),
+        "offset": offset,
+        "content_range": content_range,
+        "content_type": headers.get("Content-Type", "application/octet-stream"),
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "metadata": _user_metadata(headers),
+    }
+
+
+def _user_metadata(headers: Any) -> Dict[str, str]:
+    prefix = "x-amz-meta-"
+    return {name[len(prefix) :]: value for name, value in headers.items() if name.lower().startswith(prefix)}
+
+
+# Per-worker singleton; the FastAPI lifespan starts and closes it
+minio_client = MinioClient()
+
+
+def get_minio_client() -> MinioClient:
+    return minio_client
@@ -0,0 +1,266 @@
+import hashlib
+import itertools
+import os
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.types import Receive, Scope, Send
+
+from app.platform.config import storage_settings as settings
+from app.utils.helpers import read_chunk
+from app.utils.minio_client import MinioClient, minio_client
+from app.utils.singleflight import SingleFlight
+
+_TEMP_SUFFIX = ".tmp"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _temp_owner(name: str) -> Optional[int]:
+    # Temp names are "<file>.<pid>-<serial>.tmp"
+    _, _, tag = name.removesuffix(_TEMP_SUFFIX).rpartition(".")
+    pid = tag.partition("-")[0]
+    return int(pid) if pid.isdigit() else None
+
+
+def _remove(paths: List[str]) -> None:
+    for path in paths:
+        with suppress(FileNotFoundError):
+            os.unlink(path)
+
+
+def _move_into_place(temp_path: str, path: str) -> int:
+    os.replace(temp_path, path)
+    return os.stat(path).st_size
+
+
+class _LinkedFileResponse(FileResponse):
+    """FileResponse over a hard link made for this request, removed once the response is over."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await run_in_threadpool(_remove, [self.path])
+
+
+class DiskObjectCache:
+    """Size-bounded cache of MinIO objects on local disk, served with FileResponse.
+
+    Files are named after a hash of bucket, object and ETag, so a changed object never
+    hits an old copy. The current ETag comes from a HEAD that is trusted for
+    ``revalidate_after`` seconds (and dropped right away when this worker overwrites or
+    deletes the object). Hits are answered straight from the file: Range, If-Range and
+    the file transfer itself are left to FileResponse. Each response reads a hard link
+    made for it, so evicting the file meanwhile cannot cut the transfer short; a file
+    evicted before it was linked is streamed through ``MinioClient.download`` instead.
+    Concurrent misses on one object share a single download. Objects over
+    ``max_object_size`` are always streamed through ``MinioClient.download``.
+
+    Workers share ``directory`` and ``max_bytes`` bounds the whole directory: a sweep
+    (at startup, and whenever this worker's running total passes the budget) deletes
+    the least recently used files (hits refresh the mtime) until the directory fits,
+    along with temp files left behind by dead processes. All file system calls run
+    in the threadpool.
+    """
+
+    def __init__(
+        self,
+        client: MinioClient,
+        directory: str,
+        max_bytes: int,
+        max_object_size: int,
+        revalidate_after: float,
+        enabled: bool = True,
+        max_validated: int = 10000,
+    ):
+        self.client = client
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_object_size = max_object_size
+        self.revalidate_after = revalidate_after
+        self.enabled = enabled
+        self.max_validated = max_validated
+        # Directory totals as of the last sweep, plus this worker's fills since
+        self._files = 0
+        self._bytes = 0
+        self._serial = itertools.count()
+        self._validated: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._flights = SingleFlight()
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "evictions": 0}
+        client.change_listeners.append(self.forget)
+
+    async def start(self) -> None:
+        if self.enabled:
+            await run_in_threadpool(os.makedirs, self.directory, exist_ok=True)
+            await self._trim()
+
+    async def _trim(self) -> None:
+        await self._flights.do("sweep", lambda: run_in_threadpool(self._sweep))
+
+    def _sweep(self) -> None:
+        """Delete stale temp files, then the least recently used files until the directory fits the budget."""
+        found = []
+        stale = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(_TEMP_SUFFIX):
+                    owner = _temp_owner(entry.name)
+                    if owner is None or not _pid_alive(owner):
+                        stale.append(entry.path)
+                    continue
+                with suppress(FileNotFoundError):
+                    stat_result = entry.stat()
+                    found.append((stat_result.st_mtime, entry.path, stat_result.st_size))
+        _remove(stale)
+
+        total = sum(size for _, _, size in found)
+        evicted = []
+        for _, path, size in sorted(found):
+            if total <= self.max_bytes:
+                break
+            evicted.append(path)
+            total -= size
+        _remove(evicted)
+        self._stats["evictions"] += len(evicted)
+        self._files = len(found) - len(evicted)
+        self._bytes = total
+
+    def _file_name(self, object_name: str, etag: str) -> str:
+        key = f"{self.client.bucket_name}/{object_name}/{etag}"
+        return hashlib.blake2b(key.encode(), digest_size=20).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _temp_path(self, name: str) -> str:
+        return f"{self._path(name)}.{os.getpid()}-{next(self._serial)}{_TEMP_SUFFIX}"
+
+    async def _info(self, object_name: str) -> Dict[str, Any]:
+        validated = self._validated.get(object_name)
+        if validated is not None and time.monotonic() - validated[0] < self.revalidate_after:
+            return validated[1]
+        info = await self._flights.do(("stat", object_name), lambda: self.client.stat_file(object_name))
+        self._validated[object_name] = (time.monotonic(), info)
+        self._validated.move_to_end(object_name)
+        while len(self._validated) > self.max_validated:
+            self._validated.popitem(last=False)
+        return info
+
+    def _link(self, name: str) -> Optional[Tuple[str, os.stat_result]]:
+        """Hard-link the cached file for one response and mark it recently used; None when not on disk."""
+        link_path = self._temp_path(name)
+        try:
+            os.link(self._path(name), link_path)
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(link_path)
+            return link_path, os.stat(link_path)
+        except BaseException:
+            _remove([link_path])
+            raise
+
+    async def _fill(self, object_name: str, etag: str, name: str) -> None:
+        """Download the object (pinned to ``etag``) into a temp file, then move it into place."""
+        response, _ = await self.client.get_file(object_name, {"If-Match": etag})
+        temp_path = self._temp_path(name)
+        try:
+            file = await run_in_threadpool(open, temp_path, "wb")
+            try:
+                while chunk := await read_chunk(response.content, settings.DOWNLOAD_MAX_CHUNK):
+                    await run_in_threadpool(file.write, chunk)
+            finally:
+                await run_in_threadpool(file.close)
+            size = await run_in_threadpool(_move_into_place, temp_path, self._path(name))
+        except BaseException:
+            await run_in_threadpool(_remove, [temp_path])
+            raise
+        finally:
+            await response.release()
+        self._files += 1
+        self._bytes += size
+        if self._bytes > self.max_bytes:
+            await self._trim()
+
+    async def response(self, request: Request, object_name: str, filename: Optional[str] = None) -> Response:
+        """Serve ``object_name`` from the disk cache, filling it on a miss."""
+        if not self.enabled:
+            return await self.client.download(request, object_name, filename)
+
+        info = await self._info(object_name)
+        if info["size"] > self.max_object_size:
+            self._stats["bypassed"] += 1
+            return await self.client.download(request, object_name, filename)
+
+        headers = {"ETag": info["etag"], "Cache-Control": settings.CACHE_CONTROL}
+        if info["last_modified"]:
+            headers["Last-Modified"] = info["last_modified"]
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, info["etag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        name = self._file_name(object_name, info["etag"])
+        linked = await run_in_threadpool(self._link, name)
+        if linked is not None:
+            self._stats["hits"] += 1
+        else:
+            self._stats["misses"] += 1
+            try:
+                await self._flights.do(name, lambda: self._fill(object_name, info["etag"], name))
+            except HTTPException as exc:
+                if exc.status_code != status.HTTP_412_PRECONDITION_FAILED:
+                    raise
+                # Changed since the last HEAD: stream this request, revalidate on the next one
+                self.forget(object_name)
+                return await self.client.download(request, object_name, filename)
+            linked = await run_in_threadpool(self._link, name)
+            if linked is None:
+                # Evicted by a sweep right after the fill
+                return await self.client.download(request, object_name, filename)
+
+        link_path, stat_result = linked
+        return _LinkedFileResponse(
+            link_path,
+            headers=headers,
+            media_type=info["content_type"],
+            filename=filename,
+            stat_result=stat_result,
+        )
+
+    def forget(self, object_name: str) -> None:
+        """Drop the trusted ETag so the next request revalidates; the old file ages out of the LRU."""
+        self._validated.pop(object_name, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "files": self._files, "bytes": self._bytes}
+
+
+object_cache = DiskObjectCache(
+    minio_client,
+    settings.OBJECT_CACHE_DIR,
+    settings.OBJECT_CACHE_MAX_BYTES,
+    settings.OBJECT_CACHE_MAX_OBJECT_SIZE,
+    settings.OBJECT_CACHE_REVALIDATE,
+    settings.OBJECT_CACHE_ENABLED,
+)
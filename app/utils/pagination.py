@@ -0,0 +1,131 @@
+import base64
+import hashlib
+import hmac
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import Select, and_, literal, or_, tuple_
+
+from app.platform.config import security_settings
+
+_SIGNATURE_SIZE = 16
+
+
+def _dump_value(value: Any) -> Any:
+    # Keep the type of non-JSON sort keys so the seek parameter binds with the column type
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        if "uuid" in value:
+            return uuid.UUID(value["uuid"])
+    return value
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(security_settings.SECRET_KEY.encode(), payload, hashlib.sha256).digest()[:_SIGNATURE_SIZE]
+
+
+def query_scope(*parts: Any) -> str:
+    """Short digest of the filters a cursor was issued for (see ``encode_cursor``)."""
+    payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def encode_cursor(sort_key: str, values: Sequence[Any], scope: str = "") -> str:
+    """Opaque, signed cursor holding the sort spec, the query scope and the last row's (sort value, id).
+
+    ``scope`` (from ``query_scope``) binds the cursor to the filters of the page that
+    issued it, so it cannot be replayed against a different result set.
+    """
+    payload = orjson.dumps([sort_key, scope, [_dump_value(value) for value in values]])
+    return base64.urlsafe_b64encode(_sign(payload) + payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, List[Any]]:
+    """Inverse of encode_cursor. Raises ValueError for malformed or tampered cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    except Exception:
+        raise ValueError("Malformed cursor")
+    signature, payload = raw[:_SIGNATURE_SIZE], raw[_SIGNATURE_SIZE:]
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise ValueError("Invalid cursor signature")
+    try:
+        sort_key, scope, values = orjson.loads(payload)
+    except ValueError:
+        raise ValueError("Malformed cursor")
+    return sort_key, scope, [_load_value(value) for value in values]
+
+
+def _sort_key(sort_column: Any, descending: bool) -> str:
+    return f"{sort_column.key}:{'desc' if descending else 'asc'}"
+
+
+def apply_keyset(
+    stmt: Select,
+    sort_column: Any,
+    id_column: Any,
+    limit: int,
+    after: Optional[Tuple[str, List[Any]]] = None,
+    descending: bool = False,
+) -> Select:
+    """Seek past ``after`` with ``WHERE (sort_col, id) > (...)`` instead of OFFSET.
+
+    Any ORDER BY already on ``stmt`` is replaced: pages are only stable in the seek order.
+    A nullable ``sort_column`` puts NULLs last in both directions (``ORDER BY col IS NULL``,
+    portable to dialects without NULLS LAST) and seeks through them by id, since a
+    row comparison with NULL matches nothing. One extra row is fetched so ``keyset_page``
+    can tell whether another page exists. ``sort_column``/``id_column`` should be
+    covered by an index on (sort_col, id).
+    """
+    nullable = getattr(sort_column, "nullable", True)
+    if after is not None:
+        sort_key, values = after
+        if sort_key != _sort_key(sort_column, descending):
+            raise ValueError("Cursor does not match the requested sort")
+        last_id = literal(values[1], id_column.type)
+        if values[0] is None:
+            stmt = stmt.where(and_(sort_column.is_(None), id_column < last_id if descending else id_column > last_id))
+        else:
+            key = tuple_(sort_column, id_column)
+            seek = tuple_(literal(values[0], sort_column.type), last_id)
+            condition = key < seek if descending else key > seek
+            stmt = stmt.where(or_(condition, sort_column.is_(None)) if nullable else condition)
+
+    order = [sort_column.is_(None)] if nullable else []
+    if descending:
+        order += [sort_column.desc(), id_column.desc()]
+    else:
+        order += [sort_column.asc(), id_column.asc()]
+    return stmt.order_by(None).order_by(*order).limit(limit + 1)
+
+
+def keyset_page(
+    rows: Sequence[Any], sort_column: Any, id_column: Any, limit: int, descending: bool = False, scope: str = ""
+) -> Tuple[List[Any], Optional[str]]:
+    """Trim the look-ahead row and build ``next_cursor`` from the last row of the page."""
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    last = items[-1]
+    values = [getattr(last, sort_column.key), getattr(last, id_column.key)]
+    return items, encode_cursor(_sort_key(sort_column, descending), values, scope)
@@ -1,7 +1,18 @@
 import json
-from typing import Optional
+from typing import Literal, Optional
+from urllib.parse import urlencode
 
-from fastapi import Query
+import orjson
+from fastapi import HTTPException, Query, status
+from starlette.datastructures import QueryParams
+
+from app.utils.pagination import apply_keyset, decode_cursor, keyset_page, query_scope
+from app.utils.query_compiler import QueryCompileError, QueryCompiler, QueryValueError
+
+MAX_LIMIT = 1000
+
+# Query values equal to the defaults below are left out of normalized cache keys
+_QUERY_DEFAULTS = {"search": "", "limit": "100", "offset": "0", "pagination": "offset"}
 
 
 class CommonParams:
@@ -11,8 +22,10 @@ class CommonParams:
         sort: Optional[str] = Query(default=None),
         search: str = Query(default=""),
         group_by: Optional[str] = Query(default=None),
-        limit: int = Query(default=100, ge=1),
+        limit: int = Query(default=100, ge=1, le=MAX_LIMIT),
         offset: int = Query(default=0, ge=0),
+        pagination: Literal["offset", "cursor"] = Query(default="offset"),
+        cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
     ):
         if filter:
             try:
@@ -34,3 +47,68 @@ class CommonParams:
         self.group_by = group_by
         self.limit = limit
         self.offset = offset
+
+        # Keyset mode: pages seek past the cursor instead of scanning OFFSET rows, in the
+        # endpoint's (sort_column, id) order, which a custom sort would break
+        self.use_cursor = pagination == "cursor" or cursor is not None
+        self.after = None
+        self.scope = query_scope(self.filter, self.search, self.group_by)
+        if self.use_cursor and self.sort:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="sort is not supported with cursor pagination"
+            )
+        if cursor:
+            if offset:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either cursor or offset")
+            try:
+                sort_key, scope, values = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            if scope != self.scope:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor does not match the requested filter"
+                )
+            self.after = (sort_key, values)
+
+    def compile(self, compiler: QueryCompiler):
+        """Compile ``filter``/``sort`` with the model's QueryCompiler into ``(statement, params)``."""
+        try:
+            return compiler.compile(self.filter, self.sort)
+        except QueryValueError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        except QueryCompileError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    def paginate(self, stmt, sort_column, id_column, descending: bool = False):
+        """Apply OFFSET/LIMIT, or in cursor mode an indexed seek on (sort_column, id_column)."""
+        if not self.use_cursor:
+            return stmt.limit(self.limit).offset(self.offset)
+        try:
+            return apply_keyset(stmt, sort_column, id_column, self.limit, self.after, descending)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    def page(self, rows, sort_column, id_column, descending: bool = False):
+        """Return ``(items, next_cursor)``; next_cursor is None on the last page or in offset mode."""
+        if not self.use_cursor:
+            return list(rows), None
+        return keyset_page(rows, sort_column, id_column, self.limit, descending, self.scope)
+
+    @staticmethod
+    def normalize_query(query_params: QueryParams) -> str:
+        """Canonical query string for cache keys.
+
+        Parameters are sorted, defaults dropped and JSON ``filter``/``sort`` re-encoded
+        with sorted keys, so equivalent requests share one key.
+        """
+        items = []
+        for name, value in sorted(query_params.multi_items()):
+            if _QUERY_DEFAULTS.get(name) == value:
+                continue
+            if name in ("filter", "sort"):
+                try:
+                    value = orjson.dumps(json.loads(value), option=orjson.OPT_SORT_KEYS).decode()
+                except ValueError:
+                    pass
+            items.append((name, value))
+        return urlencode(items)
@@ -0,0 +1,192 @@
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Select, bindparam, select
+
+_OPERATORS = {
+    "eq": lambda column, param: column == param,
+    "ne": lambda column, param: column != param,
+    "lt": lambda column, param: column < param,
+    "lte": lambda column, param: column <= param,
+    "gt": lambda column, param: column > param,
+    "gte": lambda column, param: column >= param,
+    "in": lambda column, param: column.in_(param),
+    "prefix": lambda column, param: column.startswith(param, escape="\\"),
+    "is_null": lambda column, param: column.is_(None) if param else column.is_not(None),
+}
+
+
+class QueryCompileError(ValueError):
+    """Filter or sort that is malformed or not allowed for the model."""
+
+
+class QueryValueError(QueryCompileError):
+    """Filter value whose type does not fit the column it is compared with."""
+
+
+def _coerce(column: Any, value: Any) -> Any:
+    """Convert a JSON filter value to the column's Python type, or raise QueryValueError."""
+    if value is None or isinstance(value, (dict, list)):
+        raise QueryValueError(f"Filter on '{column.key}' needs a single value")
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is bool:
+        if isinstance(value, bool):
+            return value
+    elif isinstance(value, bool):
+        pass
+    elif python_type is str:
+        if isinstance(value, str):
+            return value
+    elif python_type in (int, float, Decimal):
+        if isinstance(value, (int, float)) and (python_type is not int or float(value).is_integer()):
+            return python_type(value)
+        if isinstance(value, str):
+            try:
+                return python_type(value)
+            except (ValueError, ArithmeticError):
+                pass
+    elif python_type in (datetime, date, time, uuid.UUID) and isinstance(value, str):
+        try:
+            return uuid.UUID(value) if python_type is uuid.UUID else python_type.fromisoformat(value)
+        except ValueError:
+            pass
+    elif isinstance(value, python_type) or (isinstance(value, str) and issubclass(python_type, Enum)):
+        return value
+    raise QueryValueError(f"Invalid value for '{column.key}': expected {python_type.__name__}")
+
+
+def indexed_columns(model: Any) -> Set[str]:
+    """Columns usable for seeks: primary key, unique/indexed columns and leading index columns."""
+    table = model.__table__
+    names = {column.key for column in table.primary_key.columns}
+    names.update(column.key for column in table.columns if column.index or column.unique)
+    for index in table.indexes:
+        names.add(next(iter(index.columns)).key)
+    return names
+
+
+class QueryCompiler:
+    """Compiles CommonParams ``filter``/``sort`` JSON into a cached SQLAlchemy statement.
+
+    Filters are ``[{"field": ..., "op": ..., "value": ...}]`` (or ``{"field": value}`` for
+    equality); sort is ``["field", "-field"]`` or ``"field,-field"``. Only indexed
+    columns (plus ``allow_unindexed``) may be filtered or sorted on. Values are checked
+    against, and converted to, the column's Python type (ISO strings for dates, numeric
+    strings for numbers); anything else raises QueryValueError.
+
+    The statement is built once per query *shape* (fields, operators, sort) with
+    named bind parameters, so repeated patterns reuse both the expression and
+    SQLAlchemy's compiled-SQL cache; values travel separately in the params dict.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        allow_unindexed: Iterable[str] = (),
+        base: Optional[Select] = None,
+        max_shapes: int = 256,
+    ):
+        self.model = model
+        self.allowed = indexed_columns(model) | set(allow_unindexed)
+        self.base = base if base is not None else select(model)
+        self.max_shapes = max_shapes
+        self._columns = {column.key: column for column in model.__table__.columns}
+        self._cache: "OrderedDict[Tuple, Select]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def _column(self, field: Any, purpose: str):
+        if not isinstance(field, str) or field not in self._columns:
+            raise QueryCompileError(f"Unknown {purpose} field: {field}")
+        if field not in self.allowed:
+            raise QueryCompileError(f"Field '{field}' is not indexed and cannot be used to {purpose}")
+        return self._columns[field]
+
+    @staticmethod
+    def _normalize_filter(filters: Any) -> List[Tuple[str, str, Any]]:
+        if not filters:
+            return []
+        if isinstance(filters, dict):
+            return [(field, "eq", value) for field, value in filters.items()]
+        if not isinstance(filters, list):
+            raise QueryCompileError("filter must be a JSON list or object")
+        normalized = []
+        for item in filters:
+            if not isinstance(item, dict) or "field" not in item:
+                raise QueryCompileError("Each filter needs 'field', 'op' and 'value'")
+            normalized.append((item["field"], item.get("op", "eq"), item.get("value")))
+        return normalized
+
+    @staticmethod
+    def _normalize_sort(sort: Any) -> List[Tuple[str, bool]]:
+        if not sort:
+            return []
+        if isinstance(sort, str):
+            sort = [part.strip() for part in sort.split(",") if part.strip()]
+        if not isinstance(sort, list) or not all(isinstance(part, str) for part in sort):
+            raise QueryCompileError("sort must be a list of field names")
+        return [(part.lstrip("-"), part.startswith("-")) for part in sort]
+
+    def _build(self, filters: List[Tuple[str, str, Any]], sort: List[Tuple[str, bool]]) -> Select:
+        stmt = self.base
+        for position, (field, op, value) in enumerate(filters):
+            column = self._column(field, "filter")
+            if op == "is_null":
+                param = bool(value)
+            else:
+                param = bindparam(f"f{position}", expanding=op == "in", type_=column.type)
+            stmt = stmt.where(_OPERATORS[op](column, param))
+        for field, descending in sort:
+            column = self._column(field, "sort")
+            stmt = stmt.order_by(column.desc() if descending else column.asc())
+        return stmt
+
+    def compile(self, filters: Any = None, sort: Any = None) -> Tuple[Select, Dict[str, Any]]:
+        """Return ``(statement, params)``; execute as ``session.execute(statement, params)``."""
+        filters = self._normalize_filter(filters)
+        sort = self._normalize_sort(sort)
+
+        params: Dict[str, Any] = {}
+        for position, (field, op, value) in enumerate(filters):
+            column = self._column(field, "filter")
+            if not isinstance(op, str) or op not in _OPERATORS:
+                raise QueryCompileError(f"Unsupported filter operator: {op}")
+            if op == "in":
+                if not isinstance(value, list):
+                    raise QueryValueError(f"Operator 'in' on '{field}' needs a list")
+                params[f"f{position}"] = [_coerce(column, item) for item in value]
+            elif op == "prefix":
+                if not isinstance(value, str):
+                    raise QueryValueError(f"Operator 'prefix' on '{field}' needs a string")
+                params[f"f{position}"] = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            elif op == "is_null":
+                if not isinstance(value, bool):
+                    raise QueryValueError(f"Operator 'is_null' on '{field}' needs true or false")
+            else:
+                params[f"f{position}"] = _coerce(column, value)
+
+        # is_null has no bind parameter, so its truthiness is part of the shape
+        shape = (
+            tuple((field, op, bool(value) if op == "is_null" else None) for field, op, value in filters),
+            tuple(sort),
+        )
+        stmt = self._cache.get(shape)
+        if stmt is not None:
+            self._stats["hits"] += 1
+            self._cache.move_to_end(shape)
+        else:
+            self._stats["misses"] += 1
+            stmt = self._build(filters, sort)
+            self._cache[shape] = stmt
+            if len(self._cache) > self.max_shapes:
+                self._cache.popitem(last=False)
+        return stmt, params
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "shapes": len(self._cache)}
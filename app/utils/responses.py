@@ -1,16 +1,59 @@
-from typing import Any, override
+from decimal import Decimal
+from typing import Any, Iterable, Mapping, Optional, override
 
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from pydantic_core import to_json
 
-from app.utils.helpers import orjson_dumps
+from app.utils.helpers import ORJSON_OPTIONS
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for the types orjson does not know; anything else is a bug and raises TypeError."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, BaseException):
+        # Validation errors carry the exception a validator raised in their ``ctx``
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class ORJSONResponse(JSONResponse):
-    """Custom JSONResponse menggunakan orjson."""
+    """Custom JSONResponse menggunakan orjson.
+
+    Mengembalikan bytes hasil orjson langsung (tanpa decode/encode ulang).
+    """
 
     media_type = "application/json"
 
     @override
     def render(self, content: Any) -> bytes:
         """Render content menggunakan orjson."""
-        return orjson_dumps(content)
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class RawJSONResponse(Response):
+    """Response yang body-nya sudah berupa bytes JSON."""
+
+    media_type = "application/json"
+
+
+def present(
+    content: BaseModel | Iterable[BaseModel],
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Serialize trusted model(s) straight into a response.
+
+    FastAPI returns Response objects untouched, so the route's ``response_model`` is
+    not validated and serialized a second time; it still documents the route in
+    OpenAPI. Only pass models the presenter built itself, e.g. with ``model_construct``.
+    """
+    if not isinstance(content, BaseModel):
+        content = list(content)
+    return RawJSONResponse(to_json(content), status_code=status_code, headers=headers)
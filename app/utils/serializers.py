@@ -0,0 +1,67 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import inspect
+
+from app.platform.config import app_settings
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def serializer_for(cls: type, depth: int = app_settings.SERIALIZER_MAX_DEPTH) -> Callable[[Any], Dict[str, Any]]:
+    """Build (once per mapped class and depth) a function turning an instance into a dict.
+
+    The generated function reads the instance ``__dict__`` directly, so only loaded
+    attributes are emitted: deferred or expired columns are skipped and a relationship
+    appears only if it was eagerly loaded. Nothing here can trigger lazy-load I/O.
+    Relationships are followed ``depth`` levels deep, which also bounds cycles.
+    """
+    mapper = inspect(cls)
+    columns = tuple(attr.key for attr in mapper.column_attrs)
+    namespace: Dict[str, Any] = {"_MISSING": _MISSING, "_columns": columns}
+
+    # Fast path builds the dict in one literal when every column is loaded
+    literal = ", ".join(f"{key!r}: d[{key!r}]" for key in columns)
+    lines = [
+        "def serialize(obj):",
+        "    d = obj.__dict__",
+        "    try:",
+        f"        out = {{{literal}}}",
+        "    except KeyError:",
+        "        out = {k: d[k] for k in _columns if k in d}",
+    ]
+
+    if depth > 0:
+        for index, relationship in enumerate(mapper.relationships):
+            key = relationship.key
+            nested = f"_rel{index}"
+            namespace[nested] = serializer_for(relationship.mapper.class_, depth - 1)
+            lines.append(f"    v = d.get({key!r}, _MISSING)")
+            lines.append("    if v is not _MISSING:")
+            if relationship.uselist:
+                lines.append(f"        out[{key!r}] = [{nested}(item) for item in v]")
+            else:
+                lines.append(f"        out[{key!r}] = None if v is None else {nested}(v)")
+
+    lines.append("    return out")
+    exec(compile("\n".join(lines), f"<serializer {cls.__name__}:{depth}>", "exec"), namespace)
+    return namespace["serialize"]
+
+
+def to_dict(instance: Any, depth: int = app_settings.SERIALIZER_MAX_DEPTH) -> Optional[Dict[str, Any]]:
+    if instance is None:
+        return None
+    return serializer_for(type(instance), depth)(instance)
+
+
+def to_dicts(instances: Iterable[Any], depth: int = app_settings.SERIALIZER_MAX_DEPTH) -> List[Dict[str, Any]]:
+    """Serialize a batch of rows, resolving the serializer once per run of same-class rows."""
+    result = []
+    cls = serialize = None
+    for instance in instances:
+        if type(instance) is not cls:
+            cls = type(instance)
+            serialize = serializer_for(cls, depth)
+        result.append(serialize(instance))
+    return result
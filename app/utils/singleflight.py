@@ -0,0 +1,63 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent loads of the same key into one call per worker.
+
+    The first caller for a key starts ``fn()`` as a task; everyone arriving while it
+    runs awaits that same task. A cancelled caller does not cancel the load for the
+    others.
+
+    With ``early_refresh`` > 0, a key loaded via ``do(..., ttl=...)`` becomes due for
+    refresh ``early_refresh`` seconds before its TTL ends. ``refresh_due`` hands that
+    refresh to exactly one caller, while the rest keep serving the cached value, so
+    a hot key never expires for everyone at once.
+    """
+
+    def __init__(self, early_refresh: float = 0.0, max_tracked: int = 10000):
+        self.early_refresh = early_refresh
+        self.max_tracked = max_tracked
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._refresh_at: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._stats = {"calls": 0, "shared": 0, "refreshes": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], ttl: Optional[float] = None) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            self._stats["calls"] += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _, key=key: self._calls.pop(key, None))
+        else:
+            self._stats["shared"] += 1
+
+        result = await asyncio.shield(task)
+        if ttl and self.early_refresh:
+            self._track(key, ttl)
+        return result
+
+    def _track(self, key: Hashable, ttl: float) -> None:
+        self._refresh_at[key] = time.monotonic() + max(0.0, ttl - self.early_refresh)
+        self._refresh_at.move_to_end(key)
+        while len(self._refresh_at) > self.max_tracked:
+            self._refresh_at.popitem(last=False)
+
+    def refresh_due(self, key: Hashable) -> bool:
+        """True for the one caller that should reload ``key`` ahead of its expiry."""
+        refresh_at = self._refresh_at.get(key)
+        if refresh_at is None or key in self._calls or time.monotonic() < refresh_at:
+            return False
+        del self._refresh_at[key]
+        self._stats["refreshes"] += 1
+        return True
+
+    def forget(self, key: Hashable) -> None:
+        self._refresh_at.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "in_flight": len(self._calls), "tracked": len(self._refresh_at)}
@@ -0,0 +1,114 @@
+import csv
+import io
+import re
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Literal, Optional, Sequence
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.platform.db.engine import read_session
+from app.utils.helpers import ORJSON_OPTIONS
+from app.utils.serializers import to_dicts
+
+EXPORT_BATCH_SIZE = 1000
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Spreadsheets evaluate text cells starting with these as formulas (CSV injection)
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# ... except a sign that is only the sign of a number ("-5", "+0.25", "-1e3") or stands alone
+_SIGNED_NUMBER = re.compile(r"[+-]((\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?)?")
+
+
+async def stream_batches(
+    stmt: Select,
+    params: Optional[Dict[str, Any]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    serialize: Callable[[Sequence[Any]], List[Dict[str, Any]]] = to_dicts,
+    session_factory: Callable[[], AsyncSession] = read_session,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield serialized rows of ``stmt`` in batches read from a server-side cursor.
+
+    The session is opened here rather than taken from a request dependency,
+    because dependencies are closed before a streaming body is sent.
+    """
+    async with session_factory() as session:
+        result = await session.stream_scalars(stmt.execution_options(yield_per=batch_size), params)
+        try:
+            async for partition in result.partitions(batch_size):
+                yield serialize(partition)
+        finally:
+            await result.close()
+
+
+async def ndjson_chunks(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """One chunk per batch, one JSON document per line."""
+    async for rows in batches:
+        yield b"".join(orjson.dumps(row, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE) for row in rows)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value, option=ORJSON_OPTIONS).decode("utf-8")
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES) and not _SIGNED_NUMBER.fullmatch(value):
+        # A leading quote makes the cell plain text
+        return "'" + value
+    return value
+
+
+async def csv_chunks(
+    batches: AsyncIterator[List[Dict[str, Any]]], columns: Optional[Sequence[str]] = None
+) -> AsyncIterator[bytes]:
+    """Header line plus one chunk per batch. Columns default to the first row's keys."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header_written = False
+
+    async for rows in batches:
+        if not header_written:
+            if columns is None and rows:
+                columns = list(rows[0])
+            if columns is not None:
+                writer.writerow(columns)
+                header_written = True
+        writer.writerows([_csv_value(row.get(column)) for column in columns] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if not header_written and columns is not None:
+        writer.writerow(columns)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_response(
+    stmt: Select,
+    params: Optional[Dict[str, Any]] = None,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    filename: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    serialize: Callable[[Sequence[Any]], List[Dict[str, Any]]] = to_dicts,
+    session_factory: Callable[[], AsyncSession] = read_session,
+) -> StreamingResponse:
+    """Stream the rows of ``stmt`` as NDJSON or CSV.
+
+    Only one batch is held in memory at a time: the next batch is fetched after
+    the previous chunk was handed to the server, so a slow client slows the cursor
+    down instead of growing a buffer. Combine with ``CommonParams.compile`` for
+    filtered exports.
+    """
+    batches = stream_batches(stmt, params, batch_size, serialize, session_factory)
+    body = csv_chunks(batches, columns) if format == "csv" else ndjson_chunks(batches)
+
+    headers = {}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.{format}"'
+    return StreamingResponse(body, media_type=_MEDIA_TYPES[format], headers=headers)
@@ -5,16 +5,19 @@ import resource
 import psutil
 
 
-def get_optimal_workers():
+def get_optimal_workers(hash_memory_budget_mb: int = 0):
     """
     Menghitung jumlah worker optimal berdasarkan CPU, RAM, dan karakteristik aplikasi
+
+    ``hash_memory_budget_mb`` adalah memori maksimum per worker untuk hashing password
+    (lihat PASSWORD_HASH_MEMORY_BUDGET_MB), ditambahkan ke kebutuhan RAM tiap worker.
     """
     cpu_count = multiprocessing.cpu_count()
     workers_by_cpu = (2 * cpu_count) + 1
 
     available_ram = psutil.virtual_memory().available / (1024 * 1024)
     reserved_ram = 512
-    ram_per_worker = 100
+    ram_per_worker = 100 + hash_memory_budget_mb
 
     max_workers_by_ram = int((available_ram - reserved_ram) / ram_per_worker)
 
@@ -2,10 +2,9 @@ import asyncio
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import pool
-from sqlalchemy.ext.asyncio import create_async_engine
 
 from app.platform.config import db_settings
+from app.platform.db.engine import engine_registry
 from app.platform.db.models.Base import Base
 
 # this is the Alembic Config object, which provides
@@ -65,13 +64,13 @@ async def run_migrations_online():
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
-    connectable = create_async_engine(db_settings.DATABASE_URL, poolclass=pool.NullPool, echo=False)
+    connectable = engine_registry.get()
 
     try:
         async with connectable.connect() as connection:
             await connection.run_sync(do_run_migrations)
     finally:
-        await connectable.dispose()
+        await engine_registry.dispose()
 
 
 if context.is_offline_mode():
@@ -1,8 +1,11 @@
 import uvicorn
 
 from app.core.config import settings
+from app.utils import metrics
 
 if __name__ == "__main__":
+    # Workers append to per-process metric files; start every run from an empty directory
+    metrics.clear()
     uvicorn.run(
         "app.main:app",
         host=settings.HOST,
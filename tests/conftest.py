@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Settings are read at import time, so the required ones get test values before any app import
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("MINIO_ROOT_USER", "test")
+os.environ.setdefault("MINIO_ROOT_PASSWORD", "test-password")
+os.environ.setdefault("METRICS_DIR", tempfile.mkdtemp(prefix="test-metrics-"))
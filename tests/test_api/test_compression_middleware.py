@@ -0,0 +1,189 @@
+import asyncio
+import gzip
+import zlib
+
+import brotli
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.platform.fastapi.middleware import CompressionMiddleware
+from app.utils.compression import compress_stream, negotiate
+
+PAYLOAD = {"items": [{"id": i, "name": f"item {i}"} for i in range(200)]}
+
+
+async def items(request: Request) -> Response:
+    # Answers If-None-Match itself and echoes it, so the test sees which tags reached the app
+    if_none_match = request.headers.get("if-none-match", "")
+    headers = {"ETag": '"items-v1"', "X-Seen-If-None-Match": if_none_match}
+    if '"items-v1"' in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(PAYLOAD, headers=headers)
+
+
+async def weak(request: Request) -> Response:
+    return JSONResponse(PAYLOAD, headers={"ETag": 'W/"weak"'})
+
+
+async def small(request: Request) -> Response:
+    return JSONResponse({"ok": True})
+
+
+async def image(request: Request) -> Response:
+    return Response(b"\x89PNG" + bytes(4096), media_type="image/png")
+
+
+async def download(request: Request) -> Response:
+    return Response(
+        b"x" * 4096, media_type="text/plain", headers={"Accept-Ranges": "bytes", "ETag": '"file"'}
+    )
+
+
+app = Starlette(
+    routes=[
+        Route("/items", items),
+        Route("/weak", weak),
+        Route("/small", small),
+        Route("/image", image),
+        Route("/download", download),
+    ]
+)
+
+
+@pytest.fixture
+def client():
+    transport = httpx.ASGITransport(app=CompressionMiddleware(app, minimum_size=500, offload_size=10**9))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("gzip, br, zstd", "zstd"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "zstd"),
+        ("*;q=0.5, zstd;q=0", "br"),
+        ("GZIP;q=0.8", "gzip"),
+    ],
+)
+def test_negotiate(header, expected):
+    assert negotiate(header, ("zstd", "br", "gzip")) == expected
+
+
+def test_negotiate_only_offers_available_encodings():
+    assert negotiate("zstd", ("br", "gzip")) is None
+    assert negotiate("zstd, gzip;q=0.1", ("br", "gzip")) == "gzip"
+
+
+@pytest.mark.asyncio
+async def test_compresses_with_negotiated_encoding(client):
+    response = await client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == PAYLOAD
+
+    response = await client.get("/items", headers={"Accept-Encoding": "br;q=1, gzip;q=0.5"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_leaves_small_dense_and_unaccepted_bodies_alone(client):
+    for path, accept in (("/small", "gzip"), ("/image", "gzip"), ("/items", "identity")):
+        response = await client.get(path, headers={"Accept-Encoding": accept})
+        assert "content-encoding" not in response.headers, path
+
+
+@pytest.mark.asyncio
+async def test_suffixes_strong_etags_only(client):
+    response = await client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["etag"] == '"items-v1-gzip"'
+
+    response = await client.get("/items", headers={"Accept-Encoding": "identity"})
+    assert response.headers["etag"] == '"items-v1"'
+
+    response = await client.get("/weak", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"weak"'
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_of_encoded_variant_gets_304(client):
+    response = await client.get(
+        "/items", headers={"Accept-Encoding": "gzip", "If-None-Match": '"other", "items-v1-gzip"'}
+    )
+    assert response.status_code == 304
+    # The app saw its own identity tag and answered 304 for it
+    assert response.headers["x-seen-if-none-match"] == '"other", "items-v1"'
+    # and the client gets back the tag it holds
+    assert response.headers["etag"] == '"items-v1-gzip"'
+
+    response = await client.get("/items", headers={"Accept-Encoding": "gzip", "If-None-Match": '"items-v1-br"'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"items-v1"'
+
+
+@pytest.mark.asyncio
+async def test_skips_rangeable_responses(client):
+    response = await client.get("/download", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == '"file"'
+    assert response.content == b"x" * 4096
+
+
+@pytest.mark.asyncio
+async def test_streams_are_flushed_chunk_by_chunk():
+    chunks = [f"line {i}\n".encode() * 20 for i in range(3)]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def endpoint(scope, receive, send):
+        await StreamingResponse(stream(), media_type="text/plain")(scope, receive, send)
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        await asyncio.Event().wait()  # the client never disconnects
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    await CompressionMiddleware(endpoint, minimum_size=500)(scope, receive, send)
+
+    start, *bodies = sent
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    # Each chunk decodes as soon as it arrives, without waiting for the next one
+    decoder = zlib.decompressobj(31)
+    for chunk, message in zip(chunks, bodies):
+        assert decoder.decompress(message["body"]) == chunk
+    assert bodies[-1]["more_body"] is False
+    assert gzip.decompress(b"".join(message["body"] for message in bodies)) == b"".join(chunks)
+
+
+def test_brotli_stream_round_trips():
+    stream = compress_stream("br")
+    data = b"".join(stream.compress(b"abc" * 100) for _ in range(3)) + stream.finish()
+    assert brotli.decompress(data) == b"abc" * 300
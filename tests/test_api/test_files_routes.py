@@ -0,0 +1,98 @@
+import types
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.features.files.api.routes import check_owned, router
+from app.platform.config import storage_settings
+from app.platform.fastapi.dependencies import get_current_user
+from app.utils.minio_client import get_minio_client
+
+USER = types.SimpleNamespace(id="u1")
+PREFIX = f"{storage_settings.PRESIGNED_USER_PREFIX}/{USER.id}"
+
+OWN = [f"{PREFIX}/a.png", f"{PREFIX}/docs/2024/report.pdf", f"{PREFIX}/.hidden.txt", f"{PREFIX}/a..b.txt"]
+FOREIGN = [
+    f"{storage_settings.PRESIGNED_USER_PREFIX}/u2/a.png",
+    f"{storage_settings.PRESIGNED_USER_PREFIX}/u10/a.png",  # shares the "u1" text, not the prefix
+    f"{storage_settings.PRESIGNED_USER_PREFIX}/u1",
+    "a.png",
+    f"other/{USER.id}/a.png",
+    f"/{PREFIX}/a.png",
+]
+TRAVERSAL = [
+    f"{PREFIX}/../u2/a.png",
+    f"{PREFIX}/docs/../../u2/a.png",
+    f"{PREFIX}/./a.png",
+    f"{PREFIX}/docs/.",
+    f"{PREFIX}//a.png",
+    f"{PREFIX}/",
+    f"{PREFIX}/docs/",
+    f"{PREFIX}/..",
+]
+
+
+@pytest.mark.parametrize("object_name", OWN)
+def test_own_keys_are_allowed(object_name):
+    check_owned(USER, [object_name])
+
+
+@pytest.mark.parametrize("object_name", FOREIGN + TRAVERSAL)
+def test_other_keys_are_forbidden(object_name):
+    with pytest.raises(HTTPException) as exc:
+        check_owned(USER, [object_name])
+    assert exc.value.status_code == 403
+
+
+def test_one_foreign_key_rejects_the_batch():
+    with pytest.raises(HTTPException):
+        check_owned(USER, OWN + [FOREIGN[0]])
+
+
+class FakeMinio:
+    def __init__(self):
+        self.calls = []
+
+    async def presigned_urls(self, object_names, expires):
+        self.calls.append(("presign", list(object_names)))
+        return {name: f"https://minio.test/{name}?sig" for name in object_names}
+
+    async def presigned_upload(self, object_name, expires):
+        self.calls.append(("upload", object_name))
+        return {"url": "https://minio.test/bucket", "fields": {"key": object_name}}
+
+    async def complete_upload(self, object_name):
+        self.calls.append(("complete", object_name))
+        return {"size": 1, "content_type": "image/png", "etag": '"e"'}
+
+
+@pytest.fixture
+def api():
+    fake = FakeMinio()
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: USER
+    app.dependency_overrides[get_minio_client] = lambda: fake
+    return TestClient(app), fake
+
+
+def test_routes_sign_own_keys(api):
+    client, fake = api
+
+    response = client.post("/files/presign", json={"object_names": OWN})
+    assert response.status_code == 200
+    assert sorted(response.json()["urls"]) == sorted(OWN)
+    assert client.post("/files/uploads", json={"object_name": OWN[0]}).status_code == 200
+    assert client.post("/files/uploads/complete", json={"object_name": OWN[0]}).status_code == 200
+    assert [call[0] for call in fake.calls] == ["presign", "upload", "complete"]
+
+
+@pytest.mark.parametrize("object_name", [FOREIGN[0], TRAVERSAL[0]])
+def test_routes_refuse_other_keys_before_reaching_storage(api, object_name):
+    client, fake = api
+
+    assert client.post("/files/presign", json={"object_names": [OWN[0], object_name]}).status_code == 403
+    assert client.post("/files/uploads", json={"object_name": object_name}).status_code == 403
+    assert client.post("/files/uploads/complete", json={"object_name": object_name}).status_code == 403
+    assert fake.calls == []
@@ -0,0 +1,101 @@
+import asyncio
+import itertools
+
+import pytest
+import pytest_asyncio
+
+from app.features.auth.adapters.repositories import cached_user_repository
+from app.features.auth.adapters.repositories.cached_user_repository import CachedUserRepository
+from app.features.auth.entities.user import User
+from app.utils.cache import CACHE_TTL, cache, user_email_cache_key, user_flight
+
+pytestmark = pytest.mark.asyncio
+
+_serial = itertools.count()
+
+
+class RequestRepository:
+    """Stands in for a UserRepository bound to one request's session; flights must not use it."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def by_email(self, email):
+        self.calls.append(("by_email", email))
+        return None
+
+    async def update(self, user):
+        self.calls.append(("update", user.email))
+
+
+def make_user():
+    n = next(_serial)
+    return User(id=f"user-{n}", name="Test", email=f"user{n}@example.com", password_hash="hash")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clean_cache(monkeypatch):
+    # Every load is due for refresh right away, so flight tracking is visible through refresh_due
+    monkeypatch.setattr(user_flight, "early_refresh", CACHE_TTL)
+    await cache.l1.clear()
+    yield
+    await cache.l1.clear()
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Counts the shared by-email loads and holds them until ``gate`` is set."""
+    state = {"users": {}, "calls": 0, "gate": asyncio.Event()}
+    state["gate"].set()
+
+    async def load_user_by_email(email):
+        state["calls"] += 1
+        await state["gate"].wait()
+        return state["users"].get(email)
+
+    monkeypatch.setattr(cached_user_repository, "load_user_by_email", load_user_by_email)
+    return state
+
+
+async def test_concurrent_email_misses_share_one_load_on_its_own_session(loads):
+    user = make_user()
+    loads["users"][user.email] = user
+    loads["gate"].clear()
+    inners = [RequestRepository() for _ in range(3)]
+
+    lookups = [asyncio.create_task(CachedUserRepository(inner).by_email(user.email)) for inner in inners]
+    await asyncio.sleep(0)
+    loads["gate"].set()
+
+    assert [found.id for found in await asyncio.gather(*lookups)] == [user.id] * 3
+    assert loads["calls"] == 1
+    assert all(inner.calls == [] for inner in inners)
+
+
+async def test_write_forgets_the_email_flight(loads):
+    user = make_user()
+    loads["users"][user.email] = user
+    repo = CachedUserRepository(RequestRepository())
+    await repo.by_email(user.email)
+
+    await repo.update(user)
+
+    assert user_flight.refresh_due(user_email_cache_key(user.email)) is False
+    assert await cache.get(user_email_cache_key(user.email)) is None
+
+
+async def test_email_flight_is_tracked_without_a_write(loads):
+    user = make_user()
+    loads["users"][user.email] = user
+    await CachedUserRepository(RequestRepository()).by_email(user.email)
+
+    assert user_flight.refresh_due(user_email_cache_key(user.email)) is True
+
+
+async def test_replica_reads_skip_the_shared_load(loads):
+    inner = RequestRepository()
+    email = make_user().email
+
+    assert await CachedUserRepository(inner, replica_reads=True).by_email(email) is None
+    assert loads["calls"] == 0
+    assert inner.calls == [("by_email", email)]
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.features.auth.adapters.crypto.hasher_pool import PooledPasswordHasher
+from app.features.auth.api import deps
+from app.features.auth.use_cases.ports import PasswordHasherBusy
+
+pytestmark = pytest.mark.asyncio
+
+
+class BlockingHasher:
+    """Hashes only once ``release`` is set, so tests decide when a job finishes."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def hash(self, raw: str) -> str:
+        self.started.set()
+        self.release.wait(5)
+        return f"hashed:{raw}"
+
+    def verify(self, raw: str, hashed: str) -> bool:
+        return self.hash(raw) == hashed
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return False
+
+
+def make_pool(hasher, max_concurrent=1, max_queue=0):
+    executor = ThreadPoolExecutor(max_workers=max_concurrent)
+    return PooledPasswordHasher(hasher, executor, max_concurrent=max_concurrent, max_queue=max_queue)
+
+
+async def wait_until(predicate, timeout=5.0):
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+async def test_rejects_jobs_beyond_capacity():
+    hasher = BlockingHasher()
+    pool = make_pool(hasher, max_concurrent=1, max_queue=1)
+    running = asyncio.create_task(pool.hash("a"))
+    queued = asyncio.create_task(pool.hash("b"))
+    await asyncio.to_thread(hasher.started.wait, 5)
+    assert pool.stats()["in_flight"] == 2
+    assert pool.stats()["queue_depth"] == 1
+
+    with pytest.raises(PasswordHasherBusy):
+        await pool.hash("c")
+    assert pool.stats()["rejected"] == 1
+
+    hasher.release.set()
+    assert await running == "hashed:a"
+    assert await queued == "hashed:b"
+    assert pool.stats()["in_flight"] == 0
+    assert pool.stats()["completed"] == 2
+    pool.shutdown()
+
+
+async def test_cancelled_caller_keeps_slot_until_job_finishes():
+    hasher = BlockingHasher()
+    pool = make_pool(hasher, max_concurrent=1, max_queue=0)
+    caller = asyncio.create_task(pool.hash("a"))
+    await asyncio.to_thread(hasher.started.wait, 5)
+
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    # The job is still running in the executor, so it still holds the only slot
+    assert pool.stats()["running"] == 1
+    assert pool.stats()["in_flight"] == 1
+    with pytest.raises(PasswordHasherBusy):
+        await pool.hash("b")
+
+    hasher.release.set()
+    await wait_until(lambda: pool.stats()["in_flight"] == 0)
+    assert pool.stats()["running"] == 0
+    assert await pool.hash("c") == "hashed:c"
+    pool.shutdown()
+
+
+async def test_cancelled_waiter_gives_back_its_queue_place():
+    hasher = BlockingHasher()
+    pool = make_pool(hasher, max_concurrent=1, max_queue=1)
+    running = asyncio.create_task(pool.hash("a"))
+    await asyncio.to_thread(hasher.started.wait, 5)
+    waiter = asyncio.create_task(pool.hash("b"))
+    await wait_until(lambda: pool.stats()["queue_depth"] == 1)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert pool.stats()["in_flight"] == 1
+
+    hasher.release.set()
+    assert await running == "hashed:a"
+    assert pool.stats()["in_flight"] == 0
+    pool.shutdown()
+
+
+async def test_shutdown_does_not_build_an_unused_pool():
+    deps.get_password_hasher.cache_clear()
+    deps.shutdown_password_hasher()
+    assert deps.get_password_hasher.cache_info().currsize == 0
+
+
+async def test_shutdown_stops_a_built_pool():
+    deps.get_password_hasher.cache_clear()
+    pool = deps.get_password_hasher()
+    deps.shutdown_password_hasher()
+    with pytest.raises(RuntimeError):
+        await pool.hash("a")
+    assert pool.stats()["in_flight"] == 0
+    deps.get_password_hasher.cache_clear()
@@ -0,0 +1,80 @@
+import time
+
+from app.features.auth.adapters.services.token_cache import CachedTokenService
+
+
+class CountingTokens:
+    """Inner TokenService that 'verifies' any token listed in ``claims``."""
+
+    def __init__(self, claims):
+        self.claims = claims
+        self.parses = 0
+
+    def parse(self, token):
+        self.parses += 1
+        claims = self.claims.get(token)
+        return dict(claims) if claims is not None else None
+
+
+def test_hot_token_is_verified_once():
+    inner = CountingTokens({"t": {"sub": "u1", "exp": time.time() + 60}})
+    tokens = CachedTokenService(inner)
+
+    assert tokens.parse("t")["sub"] == "u1"
+    assert tokens.parse("t")["sub"] == "u1"
+    assert inner.parses == 1
+    assert tokens.stats()["hits"] == 1
+
+
+def test_callers_cannot_change_the_cached_claims():
+    inner = CountingTokens({"t": {"sub": "u1", "scopes": ["read"], "exp": time.time() + 60}})
+    tokens = CachedTokenService(inner)
+
+    first = tokens.parse("t")  # the miss
+    first["sub"] = "admin"
+    first["scopes"].append("write")
+    second = tokens.parse("t")  # a hit
+    second["role"] = "admin"
+    second["scopes"].append("delete")
+
+    assert tokens.parse("t") == {"sub": "u1", "scopes": ["read"], "exp": inner.claims["t"]["exp"]}
+    assert inner.parses == 1
+
+
+def test_entries_expire_with_the_token():
+    inner = CountingTokens({"t": {"sub": "u1", "exp": time.time() + 0.05}, "old": {"sub": "u2", "exp": 1}})
+    tokens = CachedTokenService(inner)
+
+    tokens.parse("t")
+    time.sleep(0.06)
+    tokens.parse("t")
+    tokens.parse("old")
+    tokens.parse("old")
+
+    assert inner.parses == 4
+    assert tokens.stats()["expirations"] == 1
+
+
+def test_rejected_tokens_are_not_cached():
+    inner = CountingTokens({})
+    tokens = CachedTokenService(inner)
+
+    assert tokens.parse("bad") is None
+    assert tokens.parse("bad") is None
+    assert inner.parses == 2
+
+
+def test_lru_evicts_the_least_recently_used_token():
+    exp = time.time() + 60
+    inner = CountingTokens({name: {"sub": name, "exp": exp} for name in "abc"})
+    tokens = CachedTokenService(inner, max_size=2)
+
+    tokens.parse("a")
+    tokens.parse("b")
+    tokens.parse("a")
+    tokens.parse("c")  # evicts b
+
+    assert tokens.stats()["evictions"] == 1
+    tokens.parse("a")
+    tokens.parse("b")
+    assert inner.parses == 4
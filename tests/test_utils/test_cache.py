@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiocache import SimpleMemoryCache
+
+from app.utils.cache import TwoTierCache
+from app.utils.cache_backends import LocalBackend
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def workers():
+    """Two caches sharing one LocalBackend, like two workers sharing one Redis."""
+    l2 = LocalBackend()
+    first = TwoTierCache(SimpleMemoryCache(), l2, l1_ttl=60)
+    second = TwoTierCache(SimpleMemoryCache(), l2, l1_ttl=60)
+    await first.start()
+    await second.start()
+    yield first, second
+    await first.close()
+    await second.close()
+
+
+async def settle():
+    # Lets the invalidation listeners drain their queues
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_l1_copy_expires_with_the_l2_entry(workers):
+    first, second = workers
+    await first.set("short", {"id": 1}, ttl=1)
+
+    assert await second.get("short") == {"id": 1}
+    assert await second.l1.get("short") == {"id": 1}
+
+    await asyncio.sleep(1.1)
+    # l1_ttl alone would keep this copy for a minute
+    assert await second.l1.get("short") is None
+    assert await second.get("short") is None
+
+
+async def test_l1_copy_of_a_non_expiring_entry_uses_l1_ttl(workers):
+    first, second = workers
+    second.l1_ttl = 1
+    await first.set("forever", "value")
+
+    assert await second.get("forever") == "value"
+    await asyncio.sleep(1.1)
+    assert await second.l1.get("forever") is None
+    assert await second.get("forever") == "value"
+
+
+async def test_writes_invalidate_other_workers_l1(workers):
+    first, second = workers
+    await first.set("user:1", {"name": "old"})
+    assert await second.get("user:1") == {"name": "old"}
+
+    await first.set("user:1", {"name": "new"})
+    await settle()
+    assert await second.l1.get("user:1") is None
+    assert await second.get("user:1") == {"name": "new"}
+
+    await second.delete("user:1")
+    await settle()
+    assert await first.l1.get("user:1") is None
+    assert await first.get("user:1") is None
+
+
+async def test_own_invalidations_are_ignored(workers):
+    first, second = workers
+    await first.set("key", b"raw")
+    await settle()
+
+    assert await first.l1.get("key") == b"raw"
+    assert first.stats()["invalidations_sent"] == 1
+    assert first.stats()["invalidations_received"] == 0
+    assert second.stats()["invalidations_received"] == 1
+
+
+async def test_stats_per_tier(workers):
+    first, second = workers
+    await first.set("key", "value")
+
+    assert await second.get("missing") is None  # L1 miss, L2 miss
+    assert await second.get("key") == "value"  # L1 miss, L2 hit
+    assert await second.get("key") == "value"  # L1 hit
+
+    stats = second.stats()
+    assert (stats["l1_hits"], stats["l1_misses"]) == (1, 2)
+    assert (stats["l2_hits"], stats["l2_misses"]) == (1, 1)
+    assert stats["l1_hit_ratio"] == pytest.approx(1 / 3)
+    assert stats["l2_hit_ratio"] == pytest.approx(1 / 2)
+
+
+async def test_l1_only_without_l2():
+    cache = TwoTierCache(SimpleMemoryCache(), None)
+    await cache.start()
+    await cache.set("key", 1)
+
+    assert await cache.get("key") == 1
+    assert await cache.get("missing") is None
+    assert cache.stats()["l2_hits"] == cache.stats()["l2_misses"] == 0
+    await cache.close()
@@ -0,0 +1,100 @@
+import asyncio
+import gc
+
+import pytest
+
+from app.utils.dataloader import DataLoader
+
+pytestmark = pytest.mark.asyncio
+
+
+class Recorder:
+    """batch_fn that records each batch and when it ran."""
+
+    def __init__(self, fail=None):
+        self.batches = []
+        self.times = []
+        self.fail = fail
+        self.gate = None
+
+    async def __call__(self, keys):
+        self.batches.append(list(keys))
+        self.times.append(asyncio.get_running_loop().time())
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail is not None:
+            raise self.fail
+        return {key: f"value-{key}" for key in keys if key != "missing"}
+
+
+async def test_same_tick_loads_share_one_deduplicated_batch():
+    batch_fn = Recorder()
+    loader = DataLoader(batch_fn)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load("missing"))
+
+    assert results == ["value-1", "value-2", "value-1", None]
+    assert batch_fn.batches == [[1, 2, "missing"]]
+    assert loader.stats()["loads"] == 4
+    assert loader.stats()["batches"] == 1
+
+
+async def test_keys_beyond_max_batch_size_go_to_the_next_batch():
+    batch_fn = Recorder()
+    loader = DataLoader(batch_fn, max_batch_size=2)
+
+    assert await loader.load_many([10, 11, 12]) == ["value-10", "value-11", "value-12"]
+    assert batch_fn.batches == [[10, 11], [12]]
+
+
+async def test_full_batch_dispatches_early_and_cancels_the_timer():
+    batch_fn = Recorder()
+    window = 0.3
+    loader = DataLoader(batch_fn, max_batch_size=2, window=window)
+    loop = asyncio.get_running_loop()
+
+    first = loader.load("a")
+    assert loader._scheduled is not None
+    second = loader.load("b")  # fills the batch
+    assert loader._scheduled is None
+    async with asyncio.timeout(window / 2):
+        assert await asyncio.gather(first, second) == ["value-a", "value-b"]
+
+    await asyncio.sleep(window / 3)
+    started = loop.time()
+    third = loader.load("c")
+    assert await third == "value-c"
+    # "c" waited out its own window; the timer of the early batch never fired for it
+    assert batch_fn.times[-1] - started >= window * 0.9
+    assert batch_fn.batches == [["a", "b"], ["c"]]
+
+
+async def test_batch_failure_reaches_every_waiter():
+    batch_fn = Recorder(fail=RuntimeError("database down"))
+    loader = DataLoader(batch_fn)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), return_exceptions=True)
+
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) and str(result) == "database down" for result in results)
+
+    batch_fn.fail = None
+    assert await loader.load(1) == "value-1"
+
+
+async def test_running_batches_are_kept_referenced():
+    batch_fn = Recorder()
+    batch_fn.gate = asyncio.Event()
+    loader = DataLoader(batch_fn)
+
+    pending = loader.load(1)
+    await asyncio.sleep(0)  # dispatch
+    await asyncio.sleep(0)  # batch_fn starts and blocks on the gate
+    assert len(loader._running) == 1
+    gc.collect()
+
+    batch_fn.gate.set()
+    async with asyncio.timeout(1):
+        assert await pending == "value-1"
+    await asyncio.sleep(0)
+    assert not loader._running
@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import ClientDisconnect
+
+from app.platform.config import storage_settings
+from app.utils.minio_client import MinioClient
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeMinio:
+    """Records the multipart calls upload_stream makes on miniopy_async's Minio."""
+
+    def __init__(self, fail_part=None):
+        self.fail_part = fail_part
+        self.created = 0
+        self.parts = {}
+        self.put = None
+        self.completed = None
+        self.aborted = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _create_multipart_upload(self, bucket_name, object_name, headers):
+        self.created += 1
+        return "upload-1"
+
+    async def _upload_part(self, bucket_name, object_name, data, headers, upload_id, part_number):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if part_number == self.fail_part:
+                raise RuntimeError(f"part {part_number} failed")
+            self.parts[part_number] = data
+            return f"etag-{part_number}"
+        finally:
+            self.in_flight -= 1
+
+    async def _put_object(self, bucket_name, object_name, data, headers):
+        self.put = (object_name, data, headers)
+
+    async def _complete_multipart_upload(self, bucket_name, object_name, upload_id, parts):
+        self.completed = [(part.part_number, part.etag) for part in parts]
+
+    async def _abort_multipart_upload(self, bucket_name, object_name, upload_id):
+        self.aborted.append(upload_id)
+
+
+def make_client(fake):
+    client = MinioClient()
+    client.client = fake
+    client.bucket_ready = True
+    return client
+
+
+async def body(*chunks, then=None):
+    for chunk in chunks:
+        yield chunk
+    if then is not None:
+        raise then
+
+
+@pytest.fixture(autouse=True)
+def public_urls(monkeypatch):
+    monkeypatch.setattr(storage_settings, "MINIO_PRESIGNED", False)
+
+
+async def test_small_body_uses_a_single_put():
+    fake = FakeMinio()
+    client = make_client(fake)
+
+    url = await client.upload_stream(body(b"abc", b"def"), "users/u1/a.txt", "text/plain", part_size=10)
+
+    assert url.endswith("/users/u1/a.txt")
+    assert fake.put[1] == b"abcdef"
+    assert fake.put[2]["Content-Type"] == "text/plain"
+    assert fake.created == 0
+
+
+async def test_splits_body_into_parts():
+    fake = FakeMinio()
+    client = make_client(fake)
+    changed = []
+    client.change_listeners.append(changed.append)
+    chunks = [b"a" * 7, b"b" * 9, b"c" * 12, b"d" * 7]
+
+    await client.upload_stream(body(*chunks), "users/u1/a.txt", "text/plain", part_size=10, concurrency=2)
+
+    assert fake.created == 1
+    assert [len(fake.parts[n]) for n in sorted(fake.parts)] == [10, 10, 10, 5]
+    assert b"".join(fake.parts[n] for n in sorted(fake.parts)) == b"".join(chunks)
+    assert fake.completed == [(n, f"etag-{n}") for n in (1, 2, 3, 4)]
+    assert fake.max_in_flight <= 2
+    assert fake.aborted == []
+    assert changed == ["users/u1/a.txt"]
+
+
+async def test_rejects_body_over_max_upload_size(monkeypatch):
+    monkeypatch.setattr(storage_settings, "MAX_UPLOAD_SIZE", 25)
+    fake = FakeMinio()
+    client = make_client(fake)
+
+    with pytest.raises(HTTPException) as exc:
+        await client.upload_stream(body(*[b"x" * 10] * 3), "users/u1/a.txt", "text/plain", part_size=10)
+
+    assert exc.value.status_code == 413
+    assert fake.aborted == ["upload-1"]
+    assert fake.completed is None
+
+
+async def test_body_at_max_upload_size_is_accepted(monkeypatch):
+    monkeypatch.setattr(storage_settings, "MAX_UPLOAD_SIZE", 30)
+    fake = FakeMinio()
+    client = make_client(fake)
+
+    await client.upload_stream(body(*[b"x" * 10] * 3), "users/u1/a.txt", "text/plain", part_size=10)
+
+    assert fake.completed == [(1, "etag-1"), (2, "etag-2"), (3, "etag-3")]
+
+
+async def test_failed_part_aborts_the_upload():
+    fake = FakeMinio(fail_part=2)
+    client = make_client(fake)
+
+    with pytest.raises(RuntimeError, match="part 2 failed"):
+        await client.upload_stream(body(*[b"x" * 10] * 4), "users/u1/a.txt", "text/plain", part_size=10)
+
+    assert fake.aborted == ["upload-1"]
+    assert fake.completed is None
+
+
+async def test_client_disconnect_aborts_the_upload():
+    fake = FakeMinio()
+    client = make_client(fake)
+    changed = []
+    client.change_listeners.append(changed.append)
+
+    with pytest.raises(ClientDisconnect):
+        await client.upload_stream(
+            body(b"x" * 10, b"y" * 10, then=ClientDisconnect()), "users/u1/a.txt", "text/plain", part_size=10
+        )
+
+    assert fake.aborted == ["upload-1"]
+    assert fake.completed is None
+    assert changed == []
+
+
+async def test_rejects_disallowed_extension_before_uploading():
+    fake = FakeMinio()
+    client = make_client(fake)
+
+    with pytest.raises(HTTPException) as exc:
+        await client.upload_stream(body(b"x"), "users/u1/a.exe", "application/octet-stream")
+
+    assert exc.value.status_code == 400
+    assert fake.put is None and fake.created == 0
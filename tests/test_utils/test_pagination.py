@@ -0,0 +1,174 @@
+import base64
+from typing import Optional
+
+import orjson
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import Integer, String, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import StaticPool
+
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.params import CommonParams
+
+pytestmark = pytest.mark.asyncio
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    name: Mapped[str] = mapped_column(String(50), index=True)
+
+
+# Ties, NULLs at both ends of the id range, and NULLs between non-NULL rows
+SCORES = [5, None, 3, 5, None, 1, 3, None, 8, 5, 2, None, 3, 8, None, 1, 7, None, 5, 4, None, 2, 6, 5, None]
+ROWS = [Item(id=n, score=score, name="even" if n % 2 == 0 else "odd") for n, score in enumerate(SCORES, 1)]
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add_all([Item(id=row.id, score=row.score, name=row.name) for row in ROWS])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def make_params(**overrides) -> CommonParams:
+    values = dict(
+        filter=None, sort=None, search="", group_by=None, limit=4, offset=0, pagination="cursor", cursor=None
+    )
+    values.update(overrides)
+    return CommonParams(**values)
+
+
+async def fetch_page(session, params: CommonParams, descending: bool, name: Optional[str] = None):
+    stmt = select(Item)
+    if name is not None:
+        stmt = stmt.where(Item.name == name)
+    stmt = params.paginate(stmt.order_by(Item.name), Item.score, Item.id, descending)
+    rows = (await session.scalars(stmt)).all()
+    return params.page(rows, Item.score, Item.id, descending)
+
+
+async def walk(session, descending: bool, limit: int = 4, filter: Optional[str] = None, name: Optional[str] = None):
+    """Follow next_cursor from the first page to the last; returns the ids in page order."""
+    ids, cursor = [], None
+    for _ in range(len(ROWS) + 1):
+        params = make_params(limit=limit, cursor=cursor, filter=filter)
+        items, cursor = await fetch_page(session, params, descending, name)
+        assert len(items) <= limit
+        ids += [item.id for item in items]
+        if cursor is None:
+            return ids
+    raise AssertionError("pagination did not terminate")
+
+
+def expected_order(rows, descending: bool):
+    present = sorted((row for row in rows if row.score is not None), key=lambda row: (row.score, row.id))
+    nulls = sorted((row for row in rows if row.score is None), key=lambda row: row.id)
+    if descending:
+        present.reverse()
+        nulls.reverse()
+    # NULLs come last in both directions
+    return [row.id for row in present + nulls]
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 3, 4, 7, 25, 100])
+async def test_cursor_walk_visits_every_row_once(session, descending, limit):
+    ids = await walk(session, descending, limit)
+
+    assert len(ids) == len(set(ids)) == len(ROWS)
+    assert ids == expected_order(ROWS, descending)
+
+
+async def test_cursor_walk_with_filter(session):
+    ids = await walk(session, False, filter='{"name": "odd"}', name="odd")
+
+    assert ids == expected_order([row for row in ROWS if row.name == "odd"], False)
+
+
+async def test_last_page_has_no_cursor(session):
+    items, cursor = await fetch_page(session, make_params(limit=len(ROWS)), False)
+
+    assert len(items) == len(ROWS)
+    assert cursor is None
+
+
+async def test_offset_mode_has_no_cursor(session):
+    params = make_params(pagination="offset", limit=5, offset=5)
+    items, cursor = await fetch_page(session, params, False)
+
+    assert len(items) == 5
+    assert cursor is None
+
+
+async def test_cursor_round_trip():
+    cursor = encode_cursor("score:asc", [None, 7], "scope")
+
+    assert decode_cursor(cursor) == ("score:asc", "scope", [None, 7])
+
+
+def forge(cursor: str) -> str:
+    """Point the cursor at another row while keeping its signature."""
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    signature, payload = raw[:16], raw[16:]
+    sort_key, scope, values = orjson.loads(payload)
+    payload = orjson.dumps([sort_key, scope, [values[0], 1]])
+    return base64.urlsafe_b64encode(signature + payload).rstrip(b"=").decode()
+
+
+async def test_tampered_cursor_is_rejected(session):
+    _, cursor = await fetch_page(session, make_params(), False)
+
+    for bad in (forge(cursor), cursor[:-3], "not-a-cursor", "%%%"):
+        with pytest.raises(HTTPException) as exc:
+            make_params(cursor=bad)
+        assert exc.value.status_code == 400
+
+
+async def test_cursor_from_another_filter_is_rejected(session):
+    _, cursor = await fetch_page(session, make_params(filter='{"name": "odd"}'), False, name="odd")
+
+    with pytest.raises(HTTPException) as exc:
+        make_params(cursor=cursor, filter='{"name": "even"}')
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        make_params(cursor=cursor)
+    make_params(cursor=cursor, filter='{"name": "odd"}')
+
+
+async def test_cursor_from_another_sort_direction_is_rejected(session):
+    _, cursor = await fetch_page(session, make_params(), False)
+
+    with pytest.raises(HTTPException) as exc:
+        await fetch_page(session, make_params(cursor=cursor), True)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("overrides", [{"pagination": "cursor"}, {"pagination": "offset", "cursor": "x"}])
+async def test_cursor_mode_rejects_sort(overrides):
+    with pytest.raises(HTTPException) as exc:
+        make_params(sort='["-name"]', **overrides)
+    assert exc.value.status_code == 400
+    assert "sort" in exc.value.detail
+
+
+async def test_cursor_and_offset_together_are_rejected(session):
+    _, cursor = await fetch_page(session, make_params(), False)
+
+    with pytest.raises(HTTPException) as exc:
+        make_params(cursor=cursor, offset=10)
+    assert exc.value.status_code == 400
@@ -0,0 +1,179 @@
+from datetime import datetime
+from typing import Optional
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import Boolean, DateTime, Integer, Numeric, String
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import StaticPool
+
+from app.utils.params import CommonParams
+from app.utils.query_compiler import QueryCompileError, QueryCompiler, QueryValueError, indexed_columns
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Product(Base):
+    __tablename__ = "products"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    sku: Mapped[str] = mapped_column(String(20), unique=True)
+    name: Mapped[str] = mapped_column(String(50), index=True)
+    price: Mapped[float] = mapped_column(Numeric(10, 2), index=True)
+    active: Mapped[bool] = mapped_column(Boolean, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    notes: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    color: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+
+
+PRODUCTS = [
+    dict(id=1, sku="A-1", name="apple", price=3, active=True, created_at=datetime(2024, 1, 1), color="red"),
+    dict(id=2, sku="A-2", name="apricot", price=5, active=False, created_at=datetime(2024, 2, 1), notes="x"),
+    dict(id=3, sku="B-1", name="banana", price=2, active=True, created_at=datetime(2024, 3, 1), color="yellow"),
+    dict(id=4, sku="C_1", name="cherry", price=8, active=True, created_at=datetime(2024, 4, 1)),
+]
+
+
+def params(filter=None, sort=None) -> CommonParams:
+    return CommonParams(
+        filter=filter, sort=sort, search="", group_by=None, limit=100, offset=0, pagination="offset", cursor=None
+    )
+
+
+@pytest.fixture
+def compiler():
+    return QueryCompiler(Product, allow_unindexed=["color"])
+
+
+def test_only_indexed_and_allowed_columns_are_usable():
+    assert indexed_columns(Product) == {"id", "sku", "name", "price", "active", "created_at"}
+    compiler = QueryCompiler(Product, allow_unindexed=["color"])
+
+    compiler.compile({"color": "red"}, ["-color"])
+    with pytest.raises(QueryCompileError, match="not indexed"):
+        compiler.compile({"notes": "x"})
+    with pytest.raises(QueryCompileError, match="not indexed"):
+        compiler.compile(None, ["notes"])
+    with pytest.raises(QueryCompileError, match="Unknown"):
+        compiler.compile({"password_hash": "x"})
+    with pytest.raises(QueryCompileError, match="Unknown"):
+        compiler.compile(None, "-missing")
+
+
+@pytest.mark.parametrize(
+    "filter, detail",
+    [
+        ('{"price": "cheap"}', "price"),
+        ('{"id": 1.5}', "id"),
+        ('{"id": true}', "id"),
+        ('{"active": "yes"}', "active"),
+        ('{"created_at": "yesterday"}', "created_at"),
+        ('{"name": 5}', "name"),
+        ('{"name": null}', "name"),
+        ('[{"field": "id", "op": "in", "value": 1}]', "in"),
+        ('[{"field": "id", "op": "in", "value": [1, "two"]}]', "id"),
+        ('[{"field": "name", "op": "prefix", "value": 1}]', "prefix"),
+        ('[{"field": "notes", "op": "is_null", "value": "no"}]', "is_null"),
+    ],
+)
+def test_value_of_the_wrong_type_is_422(filter, detail):
+    compiler = QueryCompiler(Product, allow_unindexed=["notes"])
+
+    with pytest.raises(HTTPException) as exc:
+        params(filter=filter).compile(compiler)
+    assert exc.value.status_code == 422
+    assert detail in exc.value.detail
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        '{"notes": "x"}',
+        '{"missing": 1}',
+        '[{"field": "id", "op": "like", "value": 1}]',
+        '[{"value": 1}]',
+        '"name"',
+    ],
+)
+def test_malformed_or_forbidden_filter_is_400(compiler, filter):
+    with pytest.raises(HTTPException) as exc:
+        params(filter=filter).compile(compiler)
+    assert exc.value.status_code == 400
+
+
+def test_values_are_converted_to_the_column_type(compiler):
+    _, values = compiler.compile(
+        [
+            {"field": "id", "op": "in", "value": [1, "2", 3.0]},
+            {"field": "price", "op": "gte", "value": "2.5"},
+            {"field": "created_at", "op": "lt", "value": "2024-03-01T00:00:00"},
+            {"field": "sku", "op": "prefix", "value": "C_"},
+        ]
+    )
+
+    assert values["f0"] == [1, 2, 3]
+    assert str(values["f1"]) == "2.5"
+    assert values["f2"] == datetime(2024, 3, 1)
+    assert values["f3"] == "C\\_"
+    with pytest.raises(QueryValueError):
+        compiler.compile({"id": "1.5"})
+
+
+def test_statement_is_reused_per_shape(compiler):
+    first, first_values = compiler.compile({"name": "apple"}, ["-price"])
+    second, second_values = compiler.compile({"name": "banana"}, ["-price"])
+
+    assert first is second
+    assert (first_values, second_values) == ({"f0": "apple"}, {"f0": "banana"})
+    assert compiler.stats() == {"hits": 1, "misses": 1, "shapes": 1}
+
+    other, _ = compiler.compile({"name": "apple"}, ["price"])
+    assert other is not first
+    not_null, _ = compiler.compile([{"field": "color", "op": "is_null", "value": False}])
+    null, _ = compiler.compile([{"field": "color", "op": "is_null", "value": True}])
+    assert null is not not_null
+    assert compiler.stats()["shapes"] == 4
+
+
+def test_shape_cache_is_bounded():
+    compiler = QueryCompiler(Product, max_shapes=2)
+    for field in ("id", "name", "sku"):
+        compiler.compile({field: "1"})
+
+    assert compiler.stats()["shapes"] == 2
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add_all([Product(**values) for values in PRODUCTS])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filter, sort, expected",
+    [
+        ({"active": True}, ["-price"], [4, 1, 3]),
+        ([{"field": "name", "op": "prefix", "value": "ap"}], "name", [1, 2]),
+        ([{"field": "sku", "op": "prefix", "value": "C_"}], None, [4]),
+        ([{"field": "price", "op": "lt", "value": "5"}, {"field": "id", "op": "ne", "value": 3}], None, [1]),
+        ([{"field": "id", "op": "in", "value": [4, "2"]}], ["id"], [2, 4]),
+        ([{"field": "created_at", "op": "gte", "value": "2024-03-01"}], ["-created_at"], [4, 3]),
+        ([{"field": "color", "op": "is_null", "value": True}], ["id"], [2, 4]),
+    ],
+)
+async def test_compiled_statements_run(session, compiler, filter, sort, expected):
+    stmt, values = compiler.compile(filter, sort)
+    rows = (await session.scalars(stmt, values)).all()
+
+    assert [row.id for row in rows] == expected
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_concurrent_calls_share_one_load():
+    flight = SingleFlight()
+    calls = 0
+    gate = asyncio.Event()
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await gate.wait()
+        return "value"
+
+    callers = [asyncio.create_task(flight.do("key", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert await asyncio.gather(*callers) == ["value"] * 5
+    assert calls == 1
+    assert flight.stats()["shared"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+async def test_failure_reaches_every_caller_and_is_not_kept():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("load failed")
+
+    results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+    assert [str(result) for result in results] == ["load failed", "load failed"]
+
+    async def load():
+        return "value"
+
+    assert await flight.do("key", load) == "value"
+
+
+async def test_cancelled_caller_does_not_cancel_the_load():
+    flight = SingleFlight()
+    gate = asyncio.Event()
+
+    async def load():
+        await gate.wait()
+        return "value"
+
+    first = asyncio.create_task(flight.do("key", load))
+    second = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert await second == "value"
+    assert first.cancelled()
+
+
+async def test_refresh_is_handed_to_one_caller_and_forget_drops_it():
+    flight = SingleFlight(early_refresh=10)
+
+    async def load():
+        return "value"
+
+    await flight.do("key", load, ttl=10)  # due for refresh right away
+    assert flight.refresh_due("key") is True
+    assert flight.refresh_due("key") is False
+
+    await flight.do("key", load, ttl=10)
+    flight.forget("key")
+    assert flight.refresh_due("key") is False
+    assert flight.stats()["tracked"] == 0
@@ -0,0 +1,36 @@
+import csv
+import io
+
+import pytest
+
+from app.utils.streaming import csv_chunks
+
+
+async def batches(*rows):
+    yield list(rows)
+
+
+async def export(*values):
+    rows = [{"value": value} for value in values]
+    body = b"".join([chunk async for chunk in csv_chunks(batches(*rows))]).decode()
+    return [row[0] for row in csv.reader(io.StringIO(body))][1:]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "value",
+    ["=SUM(A1:A9)", "+cmd|' /C calc'!A0", "-2+3", "-=1", "@SUM(A1)", "\tdata", "\rdata", "--5", "-5e"],
+)
+async def test_formula_like_text_is_quoted(value):
+    assert await export(value) == ["'" + value]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value", ["-5", "-", "+", "-0.25", "+12", "+1.5e3", "-.5", "-7.", "plain", "a=b", "50%"])
+async def test_numbers_and_plain_text_round_trip(value):
+    assert await export(value) == [value]
+
+
+@pytest.mark.asyncio
+async def test_non_string_values_are_left_alone():
+    assert await export(-5, -0.25, None) == ["-5", "-0.25", ""]